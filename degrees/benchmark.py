@@ -0,0 +1,108 @@
+import argparse
+import random
+import time
+
+import degrees
+import util
+
+
+class ListStackFrontier():
+    """
+    The original list-backed frontier, kept only for comparison:
+    `remove` copies the list and `contains_state` scans it.
+    """
+    def __init__(self):
+        self.frontier = []
+
+    def add(self, node):
+        self.frontier.append(node)
+
+    def contains_state(self, state):
+        return any(node.state == state for node in self.frontier)
+
+    def empty(self):
+        return len(self.frontier) == 0
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[-1]
+            self.frontier = self.frontier[:-1]
+            return node
+
+
+class ListQueueFrontier(ListStackFrontier):
+
+    def remove(self):
+        if self.empty():
+            raise Exception("empty frontier")
+        else:
+            node = self.frontier[0]
+            self.frontier = self.frontier[1:]
+            return node
+
+
+# Frontier implementations compared by the benchmark
+FRONTIERS = {
+    "list": ListQueueFrontier,
+    "deque": util.QueueFrontier,
+}
+
+
+def random_pairs(count, seed):
+    """
+    Returns `count` reproducible (source, target) pairs of person ids.
+    """
+    rng = random.Random(seed)
+    person_ids = sorted(degrees.people)
+    return [(rng.choice(person_ids), rng.choice(person_ids))
+            for _ in range(count)]
+
+
+def time_frontier(frontier, pairs):
+    """
+    Runs `degrees.shortest_path` over every pair using the given
+    frontier class. Returns elapsed seconds and the path lengths found.
+    """
+    original = degrees.QueueFrontier
+    degrees.QueueFrontier = frontier
+    try:
+        start = time.perf_counter()
+        lengths = []
+        for source, target in pairs:
+            path = degrees.shortest_path(source, target)
+            lengths.append(None if path is None else len(path))
+        return time.perf_counter() - start, lengths
+    finally:
+        degrees.QueueFrontier = original
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python benchmark.py [--pairs N] [--seed S] [directory]"
+    )
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--pairs", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print("Loading data...")
+    degrees.load_data(args.directory)
+    print("Data loaded.")
+
+    pairs = random_pairs(args.pairs, args.seed)
+    results = {}
+    for name, frontier in FRONTIERS.items():
+        elapsed, lengths = time_frontier(frontier, pairs)
+        results[name] = lengths
+        print(f"{name:>6}: {elapsed:.3f}s for {len(pairs)} queries "
+              f"({1000 * elapsed / len(pairs):.2f} ms/query)")
+
+    # as duas fronteiras devem encontrar caminhos do mesmo tamanho
+    if len(set(map(tuple, results.values()))) != 1:
+        raise SystemExit("Frontiers disagree on path lengths.")
+
+
+if __name__ == "__main__":
+    main()
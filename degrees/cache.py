@@ -0,0 +1,129 @@
+from collections import OrderedDict
+
+
+class PathCache():
+    """
+    Bounded LRU cache of shortest paths, keyed by the unordered
+    (source, target) pair.
+
+    A cached path from A to B also answers B to A, and any stretch of a
+    cached path between two of its people is itself a shortest path, so
+    it answers those pairs too.
+    """
+
+    def __init__(self, search, maxsize=1024):
+        self.search = search
+        self.maxsize = maxsize
+        # chave (menor, maior) -> (pessoas, filmes) do caminho, ou None
+        self.entries = OrderedDict()
+        # pessoa -> chaves dos caminhos guardados que passam por ela
+        self.members = {}
+        self.hits = 0
+        self.subpath_hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        """
+        Returns the cache counters as a dictionary.
+        """
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "subpath_hits": self.subpath_hits,
+            "misses": self.misses,
+        }
+
+    def shortest_path(self, source, target, *args):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target, calling the wrapped
+        search (with any extra arguments) only on a cache miss.
+
+        If no possible path, returns None.
+        """
+        key = (source, target) if source <= target else (target, source)
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return _slice(self.entries[key], source, target)
+
+        # as duas pessoas aparecem num mesmo caminho já guardado
+        key = self._shared_entry(source, target)
+        if key is not None:
+            self.subpath_hits += 1
+            self.entries.move_to_end(key)
+            return _slice(self.entries[key], source, target)
+
+        self.misses += 1
+        path = self.search(source, target, *args)
+        self._store(source, path, target)
+        return path
+
+    def _shared_entry(self, source, target):
+        source_keys = self.members.get(source)
+        target_keys = self.members.get(target)
+        if not source_keys or not target_keys:
+            return None
+        if len(source_keys) > len(target_keys):
+            source_keys, target_keys = target_keys, source_keys
+        for key in source_keys:
+            if key in target_keys:
+                return key
+        return None
+
+    def _store(self, source, path, target):
+        if self.maxsize <= 0:
+            return
+        if source <= target:
+            key = (source, target)
+        else:
+            key = (target, source)
+            path = _reverse(source, path)
+
+        if path is None:
+            entry = None
+        else:
+            entry = ([key[0]] + [person for _, person in path],
+                     [None] + [movie for movie, _ in path])
+            for person in entry[0]:
+                self.members.setdefault(person, set()).add(key)
+        self.entries[key] = entry
+
+        while len(self.entries) > self.maxsize:
+            old_key, old_entry = self.entries.popitem(last=False)
+            if old_entry is None:
+                continue
+            for person in old_entry[0]:
+                keys = self.members[person]
+                keys.discard(old_key)
+                if not keys:
+                    del self.members[person]
+
+
+def _reverse(source, path):
+    """
+    Reverses a (movie_id, person_id) path that starts at the source.
+    """
+    if path is None:
+        return None
+    people = [source] + [person for _, person in path]
+    return [(path[i][0], people[i]) for i in range(len(path) - 1, -1, -1)]
+
+
+def _slice(entry, source, target):
+    """
+    Returns the stretch of a cached entry from source to target, in
+    either direction.
+    """
+    if entry is None:
+        return None
+    people, movies = entry
+    i = people.index(source)
+    j = people.index(target)
+    if i <= j:
+        return [(movies[k], people[k]) for k in range(i + 1, j + 1)]
+    return [(movies[k + 1], people[k]) for k in range(i - 1, j - 1, -1)]
@@ -0,0 +1,429 @@
+import csv
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+from nameindex import NameIndex
+
+# Binary snapshot written next to the CSV files
+SNAPSHOT = "degrees.snapshot"
+SNAPSHOT_MAGIC = b"DEGSNAP\0"
+SNAPSHOT_VERSION = 3
+
+# CSV files whose size and mtime invalidate the snapshot
+SOURCES = ("people.csv", "movies.csv", "stars.csv")
+
+# Snapshot sections, in file order
+STRING_SECTIONS = (
+    "person_ids", "person_names", "person_births",
+    "movie_ids", "movie_titles", "movie_years",
+)
+ARRAY_SECTIONS = (
+    "person_offsets", "person_movies",
+    "movie_offsets", "movie_stars", "name_order",
+)
+# Name index sections, after the graph when the header flags them, in the
+# order of NameIndex.tables
+INDEX_SECTIONS = (
+    ("names", "string"), ("people_offsets", "array"), ("people", "array"),
+    ("trigrams", "string"), ("trigram_offsets", "array"),
+    ("postings", "array"),
+)
+
+# magic, version, byte order, name index flag, then size and mtime of
+# each source file
+HEADER = struct.Struct("<8sIB?2x" + "qq" * len(SOURCES))
+# (offset, length) of every section
+SECTION = struct.Struct("<qq")
+
+
+class CompactGraph():
+    """
+    Integer-indexed view of the IMDB star graph.
+
+    People and movies are numbered 0..n-1 in IMDB id order, and the
+    bipartite star graph is kept as two CSR adjacency lists:
+    `person_movies[person_offsets[p]:person_offsets[p + 1]]` are the
+    movies of person `p`, and `movie_stars[movie_offsets[m]:...]` are
+    the stars of movie `m`. `name_index` is a NameIndex over the
+    people's names, for suggestions when a name is not found; unless
+    it was loaded from the snapshot, it is built on first use.
+    """
+
+    def __init__(self, person_ids, person_names, person_births,
+                 movie_ids, movie_titles, movie_years,
+                 person_offsets, person_movies,
+                 movie_offsets, movie_stars, name_order, name_index=None):
+        self.person_ids = person_ids
+        self.person_names = person_names
+        self.person_births = person_births
+        self.movie_ids = movie_ids
+        self.movie_titles = movie_titles
+        self.movie_years = movie_years
+        self.person_offsets = person_offsets
+        self.person_movies = person_movies
+        self.movie_offsets = movie_offsets
+        self.movie_stars = movie_stars
+        # índices das pessoas ordenados pelo nome em minúsculas
+        self.name_order = name_order
+        self._name_index = name_index
+        # o índice de nomes já está gravado no snapshot
+        self.name_index_saved = name_index is not None
+
+    @property
+    def name_index(self):
+        if self._name_index is None:
+            self._name_index = NameIndex(
+                (name, person) for person, name in enumerate(self.person_names)
+            )
+        return self._name_index
+
+    def __len__(self):
+        return len(self.person_ids)
+
+    def person_index(self, person_id):
+        """
+        Returns the integer index for an IMDB person id, or None.
+        """
+        i = bisect_left(self.person_ids, person_id)
+        if i < len(self.person_ids) and self.person_ids[i] == person_id:
+            return i
+        return None
+
+    def movie_index(self, movie_id):
+        """
+        Returns the integer index for an IMDB movie id, or None.
+        """
+        i = bisect_left(self.movie_ids, movie_id)
+        if i < len(self.movie_ids) and self.movie_ids[i] == movie_id:
+            return i
+        return None
+
+    def person_indices_for_name(self, name):
+        """
+        Returns the indices of every person with the given name,
+        ignoring case.
+        """
+        name = name.lower()
+        names = self.person_names
+        order = self.name_order
+        i = bisect_left(order, name, key=lambda p: names[p].lower())
+        matches = []
+        while i < len(order) and names[order[i]].lower() == name:
+            matches.append(order[i])
+            i += 1
+        return matches
+
+    def degree(self, person):
+        """
+        Returns the number of movies a person starred in.
+        """
+        return self.person_offsets[person + 1] - self.person_offsets[person]
+
+    def neighbors_for_person(self, person):
+        """
+        Yields (movie, person) index pairs for people who starred with
+        a given person, walking the CSR slices in place.
+        """
+        person_movies = self.person_movies
+        movie_offsets = self.movie_offsets
+        movie_stars = self.movie_stars
+        for i in range(self.person_offsets[person],
+                       self.person_offsets[person + 1]):
+            movie = person_movies[i]
+            for j in range(movie_offsets[movie], movie_offsets[movie + 1]):
+                yield movie, movie_stars[j]
+
+    def path_ids(self, path):
+        """
+        Converts a path of (movie, person) indices into IMDB ids.
+        """
+        if path is None:
+            return None
+        return [(self.movie_ids[movie], self.person_ids[person])
+                for movie, person in path]
+
+
+class StringTable():
+    """
+    Read-only sequence of strings stored as one UTF-8 blob plus an
+    array of offsets, decoded on access.
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("string table index out of range")
+        start, end = self.offsets[i], self.offsets[i + 1]
+        return str(self.blob[start:end], "utf-8")
+
+
+def load_compact(directory, cache=True):
+    """
+    Load data into a CompactGraph, memory-mapping the binary snapshot
+    in `directory` when it is up to date with the CSV files.
+
+    Otherwise the CSV files are parsed and, if `cache` is set, a fresh
+    snapshot is written for the next run.
+    """
+    path = os.path.join(directory, SNAPSHOT)
+    signature = _signature(directory)
+    if cache:
+        graph = load_snapshot(path, signature)
+        if graph is not None:
+            return graph
+
+    graph = _parse_csv(directory)
+    if cache:
+        try:
+            save_snapshot(graph, path, signature)
+        except OSError:
+            # diretório somente leitura: segue sem cache
+            pass
+    return graph
+
+
+def save_name_index(graph, directory):
+    """
+    Rewrites the snapshot in `directory` with the graph's name index if
+    it was built after the snapshot was saved, so that the next run
+    maps the index instead of building it again.
+    """
+    if graph.name_index_saved or graph._name_index is None:
+        return
+    try:
+        save_snapshot(graph, os.path.join(directory, SNAPSHOT),
+                      _signature(directory))
+    except OSError:
+        pass
+
+
+def _parse_csv(directory):
+    """
+    Load data from CSV files into a CompactGraph.
+    """
+    # Load people
+    with open(f"{directory}/people.csv", encoding="utf-8") as f:
+        rows = sorted(
+            ((row["id"], row["name"], row["birth"])
+             for row in csv.DictReader(f)),
+            key=lambda row: row[0]
+        )
+    person_ids = [row[0] for row in rows]
+    person_names = [row[1] for row in rows]
+    person_births = [row[2] for row in rows]
+    del rows
+
+    # Load movies
+    with open(f"{directory}/movies.csv", encoding="utf-8") as f:
+        rows = sorted(
+            ((row["id"], row["title"], row["year"])
+             for row in csv.DictReader(f)),
+            key=lambda row: row[0]
+        )
+    movie_ids = [row[0] for row in rows]
+    movie_titles = [row[1] for row in rows]
+    movie_years = [row[2] for row in rows]
+    del rows
+
+    # Load stars, keeping each (person, movie) pair once
+    person_index = {person_id: i for i, person_id in enumerate(person_ids)}
+    movie_index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+    seen = set()
+    star_people = array("i")
+    star_movies = array("i")
+    with open(f"{directory}/stars.csv", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            person = person_index.get(row["person_id"])
+            movie = movie_index.get(row["movie_id"])
+            if person is None or movie is None:
+                continue
+            key = person * len(movie_ids) + movie
+            if key in seen:
+                continue
+            seen.add(key)
+            star_people.append(person)
+            star_movies.append(movie)
+    del person_index, movie_index, seen
+
+    person_offsets, person_movies = _csr(
+        star_people, star_movies, len(person_ids)
+    )
+    movie_offsets, movie_stars = _csr(
+        star_movies, star_people, len(movie_ids)
+    )
+    name_order = array("i", sorted(
+        range(len(person_ids)), key=lambda p: person_names[p].lower()
+    ))
+
+    return CompactGraph(
+        person_ids, person_names, person_births,
+        movie_ids, movie_titles, movie_years,
+        person_offsets, person_movies,
+        movie_offsets, movie_stars, name_order
+    )
+
+
+def _signature(directory):
+    """
+    Returns the (size, mtime) of every source CSV file.
+    """
+    signature = []
+    for filename in SOURCES:
+        stat = os.stat(os.path.join(directory, filename))
+        signature.extend((stat.st_size, stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def _byteorder():
+    return 0 if sys.byteorder == "little" else 1
+
+
+def save_snapshot(graph, path, signature):
+    """
+    Writes `graph` to a binary snapshot at `path`, tagged with the
+    signature of the CSV files it was built from. The name index is
+    written only if it has been built.
+    """
+    has_index = graph._name_index is not None
+    sections = []
+    for name in STRING_SECTIONS:
+        sections.extend(_string_section(getattr(graph, name)))
+    for name in ARRAY_SECTIONS:
+        sections.append(array("i", getattr(graph, name)).tobytes())
+    if has_index:
+        for (_, kind), table in zip(INDEX_SECTIONS,
+                                    graph.name_index.tables()):
+            if kind == "string":
+                sections.extend(_string_section(table))
+            else:
+                sections.append(array("i", table).tobytes())
+
+    # escreve num arquivo temporário e troca no final, para que uma
+    # execução interrompida nunca deixe um snapshot pela metade
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                _byteorder(), has_index, *signature))
+            table = f.tell()
+            f.write(bytes(SECTION.size * len(sections)))
+            positions = []
+            for data in sections:
+                # alinha cada seção para permitir memoryview.cast
+                f.write(bytes(-f.tell() % 8))
+                positions.append((f.tell(), len(data)))
+                f.write(data)
+            f.seek(table)
+            for position in positions:
+                f.write(SECTION.pack(*position))
+        os.replace(temporary, path)
+        graph.name_index_saved = has_index
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _string_section(values):
+    """
+    Returns the offsets and UTF-8 blob of a StringTable, as bytes.
+    """
+    strings = [value.encode("utf-8") for value in values]
+    offsets = array("q", [0])
+    for value in strings:
+        offsets.append(offsets[-1] + len(value))
+    return offsets.tobytes(), b"".join(strings)
+
+
+def load_snapshot(path, signature):
+    """
+    Memory-maps the snapshot at `path` into a CompactGraph.
+
+    Returns None if the snapshot is missing, from another version or
+    byte order, was built from different CSV files, or is truncated or
+    otherwise damaged.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        tables, has_index = _read_sections(data, signature)
+    except (struct.error, TypeError, ValueError):
+        return None
+    if tables is None:
+        return None
+
+    graph_count = len(STRING_SECTIONS) + len(ARRAY_SECTIONS)
+    fields = dict(zip(STRING_SECTIONS + ARRAY_SECTIONS, tables))
+    if has_index:
+        fields["name_index"] = NameIndex.from_tables(*tables[graph_count:])
+    return CompactGraph(**fields)
+
+
+def _read_sections(data, signature):
+    """
+    Checks the header of a mapped snapshot and returns its tables and
+    name index flag, or (None, False) if it does not match `signature`.
+    Raises ValueError if a section lies outside the file.
+    """
+    magic, version, byteorder, has_index, *stored = HEADER.unpack_from(data)
+    if (magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION
+            or byteorder != _byteorder() or tuple(stored) != signature):
+        return None, False
+
+    view = memoryview(data)
+    kinds = (["string"] * len(STRING_SECTIONS)
+             + ["array"] * len(ARRAY_SECTIONS)
+             + [kind for _, kind in INDEX_SECTIONS if has_index])
+    position = HEADER.size
+    tables = []
+    for kind in kinds:
+        parts = []
+        for _ in range(2 if kind == "string" else 1):
+            offset, length = SECTION.unpack_from(data, position)
+            position += SECTION.size
+            # um arquivo truncado daria fatias curtas em silêncio
+            if offset < 0 or length < 0 or offset + length > len(data):
+                raise ValueError("snapshot section out of bounds")
+            parts.append(view[offset:offset + length])
+        if kind == "string":
+            offsets = parts[0].cast("q")
+            if len(offsets) == 0 or offsets[-1] > len(parts[1]):
+                raise ValueError("snapshot string table out of bounds")
+            tables.append(StringTable(offsets, parts[1]))
+        else:
+            tables.append(parts[0].cast("i"))
+    return tables, has_index
+
+
+def _csr(sources, targets, count):
+    """
+    Groups the edges sources[i] -> targets[i] by source with a counting
+    sort. Returns (offsets, targets) arrays in CSR layout.
+    """
+    offsets = array("i", bytes(4 * (count + 1)))
+    for source in sources:
+        offsets[source + 1] += 1
+    for i in range(count):
+        offsets[i + 1] += offsets[i]
+
+    # posição livre de cada linha enquanto os vizinhos são distribuídos
+    cursor = array("i", offsets[:-1])
+    grouped = array("i", bytes(4 * len(targets)))
+    for source, target in zip(sources, targets):
+        grouped[cursor[source]] = target
+        cursor[source] += 1
+    return offsets, grouped
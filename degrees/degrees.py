@@ -1,6 +1,14 @@
+import argparse
 import csv
+import functools
+import json
+import multiprocessing
 import sys
+from collections import deque
 
+from cache import PathCache
+from compact import load_compact, save_name_index
+from nameindex import NameIndex
 from util import Node, StackFrontier, QueueFrontier
 
 # Maps names to a set of corresponding person_ids
@@ -12,6 +20,10 @@ people = {}
 # Maps movie_ids to a dictionary of: title, year, stars (a set of person_ids)
 movies = {}
 
+# CompactGraph and search used by batch queries, shared with worker processes
+batch_graph = None
+batch_search = None
+
 
 def load_data(directory):
     """
@@ -53,24 +65,202 @@ def load_data(directory):
 
 
 def main():
-    if len(sys.argv) > 2:
-        sys.exit("Usage: python degrees.py [directory]")
-    directory = sys.argv[1] if len(sys.argv) == 2 else "large"
+    parser = argparse.ArgumentParser(usage="python degrees.py [--search MODE] [--compact | --batch FILE [--workers N]] [directory]")
+    parser.add_argument("directory", nargs="?", default="large")
+    parser.add_argument("--search", choices=sorted(SEARCHES), default="bfs")
+    parser.add_argument("--compact", action="store_true",
+                        help="use the integer-indexed CSR graph")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="answer tab-separated source/target pairs "
+                             "from FILE ('-' for stdin) as JSON lines")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes for --batch")
+    parser.add_argument("--cache", type=int, default=0, metavar="SIZE",
+                        help="paths cached by each --batch worker")
+    args = parser.parse_args()
+    directory = args.directory
+    search = SEARCHES[args.search]
+
+    if args.batch is not None:
+        if args.batch == "-":
+            run_batch(directory, sys.stdin, sys.stdout,
+                      args.search, args.workers, args.cache)
+        else:
+            with open(args.batch, encoding="utf-8") as f:
+                run_batch(directory, f, sys.stdout,
+                          args.search, args.workers, args.cache)
+        return
 
     # Load data from files into memory
     print("Loading data...")
-    load_data(directory)
+    if args.compact:
+        graph = load_compact(directory)
+    else:
+        load_data(directory)
     print("Data loaded.")
 
-    source = person_id_for_name(input("Name: "))
-    if source is None:
-        sys.exit("Person not found.")
-    target = person_id_for_name(input("Name: "))
-    if target is None:
-        sys.exit("Person not found.")
+    if args.compact:
+        source = prompt_person(
+            lambda name: person_index_for_name(graph, name),
+            lambda: graph.name_index, graph.person_names.__getitem__
+        )
+        target = prompt_person(
+            lambda name: person_index_for_name(graph, name),
+            lambda: graph.name_index, graph.person_names.__getitem__
+        )
+        # guarda no snapshot o índice construído por um nome não encontrado
+        save_name_index(graph, directory)
+
+        path = search(source, target, graph.neighbors_for_person)
+        print_path(source, path,
+                   graph.person_names.__getitem__,
+                   graph.movie_titles.__getitem__)
+    else:
+        # construído só quando algum nome não é encontrado
+        index = functools.cache(
+            lambda: NameIndex((p["name"], i) for i, p in people.items())
+        )
+        source = prompt_person(person_id_for_name, index,
+                               lambda person_id: people[person_id]["name"])
+        target = prompt_person(person_id_for_name, index,
+                               lambda person_id: people[person_id]["name"])
+
+        path = search(source, target)
+        print_path(source, path,
+                   lambda person_id: people[person_id]["name"],
+                   lambda movie_id: movies[movie_id]["title"])
+
+
+def run_batch(directory, lines, out, search="bfs", workers=None, cache=0):
+    """
+    Answers one shortest-path query per line of `lines`, writing one
+    JSON object per query to `out` in input order.
+
+    Each line holds a source and a target separated by a tab; either
+    may be an IMDB person id or an unambiguous name. The graph is
+    loaded once and shared with a pool of `workers` processes, each
+    keeping up to `cache` recent paths.
+    """
+    global batch_graph
+    batch_graph = load_compact(directory)
+    _init_batch_worker(directory, search, cache)
+
+    queries = (line.rstrip("\n") for line in lines if line.strip())
+    if workers == 1:
+        for answer in map(answer_query, queries):
+            out.write(answer + "\n")
+            out.flush()
+        return
+
+    # com "fork" os processos herdam o grafo já carregado (copy-on-write);
+    # nos demais casos cada processo mapeia o mesmo snapshot em memória
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context(
+        "fork" if "fork" in methods else None
+    )
+    with context.Pool(workers, initializer=_init_batch_worker,
+                      initargs=(directory, search, cache)) as pool:
+        for answer in pool.imap(answer_query, queries, chunksize=16):
+            out.write(answer + "\n")
+            out.flush()
+
+
+def _init_batch_worker(directory, search, cache):
+    global batch_graph, batch_search
+    if batch_graph is None:
+        batch_graph = load_compact(directory)
+    batch_search = SEARCHES[search]
+    if cache > 0:
+        batch_search = PathCache(batch_search, cache).shortest_path
+
+
+def answer_query(line):
+    """
+    Answers one batch query line, returning a JSON string with the
+    path as [movie_id, person_id] pairs, or with an error message.
+    """
+    answer = {"query": line}
+    try:
+        source_name, target_name = line.split("\t")
+    except ValueError:
+        answer["error"] = "expected a source and a target separated by a tab"
+        return json.dumps(answer)
+
+    endpoints = []
+    for name in (source_name, target_name):
+        person = _batch_person(name.strip())
+        if isinstance(person, str):
+            answer["error"] = person
+            return json.dumps(answer)
+        endpoints.append(person)
+
+    source, target = endpoints
+    path = batch_search(source, target, batch_graph.neighbors_for_person)
+    answer["source"] = batch_graph.person_ids[source]
+    answer["target"] = batch_graph.person_ids[target]
+    if path is None:
+        answer["degrees"] = None
+        answer["path"] = None
+    else:
+        answer["degrees"] = len(path)
+        answer["path"] = [list(step) for step in batch_graph.path_ids(path)]
+    return json.dumps(answer)
+
+
+def _batch_person(name):
+    """
+    Resolves a batch query endpoint to a person index, or returns an
+    error message.
+    """
+    index = batch_graph.person_index(name)
+    if index is not None:
+        return index
+    indices = batch_graph.person_indices_for_name(name)
+    if len(indices) == 0:
+        return f"person not found: {name}"
+    elif len(indices) > 1:
+        return f"ambiguous name: {name}"
+    return indices[0]
+
+
+def prompt_person(resolve, index, person_name):
+    """
+    Asks for a name until `resolve` finds the person and returns it.
+
+    When a name is not found, the closest names in the NameIndex
+    returned by `index` are listed by number: the user can type a
+    number to pick one, or another name to try again. An empty line
+    exits. `index` is only called after a miss, so the NameIndex can
+    be built on demand.
+    """
+    name = input("Name: ")
+    while True:
+        person = resolve(name)
+        if person is not None:
+            return person
+
+        suggestions = [person_name(matches[0])
+                       for _, _, matches in index().search(name, limit=5)]
+        if not suggestions:
+            sys.exit("Person not found.")
+        print("Person not found. Did you mean:")
+        for i, suggestion in enumerate(suggestions, 1):
+            print(f"  {i}: {suggestion}")
+        try:
+            name = input("Number or name (empty to quit): ").strip()
+        except EOFError:
+            name = ""
+        if not name:
+            sys.exit("Person not found.")
+        if name.isdigit() and 1 <= int(name) <= len(suggestions):
+            name = suggestions[int(name) - 1]
 
-    path = shortest_path(source, target)
 
+def print_path(source, path, person_name, movie_title):
+    """
+    Prints a path returned by one of the searches, using `person_name`
+    and `movie_title` to label its people and movies.
+    """
     if path is None:
         print("Not connected.")
     else:
@@ -78,19 +268,25 @@ def main():
         print(f"{degrees} degrees of separation.")
         path = [(None, source)] + path
         for i in range(degrees):
-            person1 = people[path[i][1]]["name"]
-            person2 = people[path[i + 1][1]]["name"]
-            movie = movies[path[i + 1][0]]["title"]
+            person1 = person_name(path[i][1])
+            person2 = person_name(path[i + 1][1])
+            movie = movie_title(path[i + 1][0])
             print(f"{i + 1}: {person1} and {person2} starred in {movie}")
 
 
-def shortest_path(source, target):
+def shortest_path(source, target, neighbors=None):
     """
     Returns the shortest list of (movie_id, person_id) pairs
     that connect the source to the target.
 
+    `neighbors` maps a person to its (movie, person) pairs and defaults
+    to `neighbors_for_person`.
+
     If no possible path, returns None.
     """
+    if neighbors is None:
+        neighbors = neighbors_for_person
+
     inicio = Node(state=source, parent=None, action=None)
     fila = QueueFrontier()
     fila.add(inicio)
@@ -117,7 +313,7 @@ def shortest_path(source, target):
 
         # coloca o ator em "explorado"
         explorado.add(node.state)
-        relacionados = neighbors_for_person(node.state)
+        relacionados = neighbors(node.state)
         
         # faz pesquisa nos vizinhos do nó atual
         for filme, ator in relacionados:
@@ -136,7 +332,134 @@ def shortest_path(source, target):
                     return resultado
 
                 fila.add(filho)
-                
+
+
+def shortest_path_bidirectional(source, target, neighbors=None):
+    """
+    Returns the shortest list of (movie_id, person_id) pairs
+    that connect the source to the target, growing one BFS frontier
+    from each end until they meet.
+
+    `neighbors` maps a person to its (movie, person) pairs and defaults
+    to `neighbors_for_person`.
+
+    If no possible path, returns None.
+    """
+    if neighbors is None:
+        neighbors = neighbors_for_person
+    if source == target:
+        return []
+
+    # para cada lado, guarda de onde cada ator foi alcançado: (filme, ator anterior)
+    pais_inicio = {source: None}
+    pais_fim = {target: None}
+    fronteira_inicio = [source]
+    fronteira_fim = [target]
+
+    while fronteira_inicio and fronteira_fim:
+        # expande sempre a menor fronteira, uma camada inteira por vez
+        if len(fronteira_inicio) <= len(fronteira_fim):
+            fronteira_inicio, encontro = _expand_layer(
+                fronteira_inicio, pais_inicio, pais_fim, neighbors
+            )
+        else:
+            fronteira_fim, encontro = _expand_layer(
+                fronteira_fim, pais_fim, pais_inicio, neighbors
+            )
+
+        # as buscas se encontraram: junta as duas metades do caminho
+        if encontro is not None:
+            return _join_paths(encontro, pais_inicio, pais_fim)
+
+    return None
+
+
+def _expand_layer(fronteira, pais, pais_outro_lado, neighbors):
+    """
+    Expands every person in one BFS layer, recording parents in `pais`.
+
+    Returns the next layer and the first person already reached by the
+    other search, or None if the searches have not met yet.
+    """
+    proxima = []
+    for ator in fronteira:
+        for filme, vizinho in neighbors(ator):
+            if vizinho in pais:
+                continue
+            pais[vizinho] = (filme, ator)
+
+            # com camadas completas, o primeiro encontro já é um caminho mínimo
+            if vizinho in pais_outro_lado:
+                return proxima, vizinho
+            proxima.append(vizinho)
+    return proxima, None
+
+
+def _join_paths(encontro, pais_inicio, pais_fim):
+    """
+    Builds the (movie_id, person_id) path through the meeting person
+    from the parents recorded by both searches.
+    """
+    resultado = []
+
+    # do encontro de volta ao "source"
+    ator = encontro
+    while pais_inicio[ator] is not None:
+        filme, anterior = pais_inicio[ator]
+        resultado.append((filme, ator))
+        ator = anterior
+    resultado.reverse()
+
+    # do encontro até o "target"
+    ator = encontro
+    while pais_fim[ator] is not None:
+        filme, proximo = pais_fim[ator]
+        resultado.append((filme, proximo))
+        ator = proximo
+
+    return resultado
+
+
+def distances_from(source, neighbors=None):
+    """
+    Runs a single BFS from the source and returns a dictionary mapping
+    every reachable person to (distance, movie_id, parent), where
+    `parent` is the previous person on a shortest path from the source.
+
+    The source itself maps to (0, None, None).
+    """
+    if neighbors is None:
+        neighbors = neighbors_for_person
+
+    arvore = {source: (0, None, None)}
+    fila = deque([source])
+    while fila:
+        ator = fila.popleft()
+        distancia = arvore[ator][0] + 1
+        for filme, vizinho in neighbors(ator):
+            if vizinho not in arvore:
+                arvore[vizinho] = (distancia, filme, ator)
+                fila.append(vizinho)
+    return arvore
+
+
+def path_from_tree(tree, target):
+    """
+    Returns the (movie_id, person_id) path from the root of a tree
+    built by `distances_from` to the target, or None if the target
+    was not reached.
+    """
+    if target not in tree:
+        return None
+    resultado = []
+    _, filme, anterior = tree[target]
+    while anterior is not None:
+        resultado.append((filme, target))
+        target = anterior
+        _, filme, anterior = tree[target]
+    resultado.reverse()
+    return resultado
+
 
 def person_id_for_name(name):
     """
@@ -164,6 +487,32 @@ def person_id_for_name(name):
         return person_ids[0]
 
 
+def person_index_for_name(graph, name):
+    """
+    Returns the CompactGraph index for a person's name,
+    resolving ambiguities as needed.
+    """
+    indices = graph.person_indices_for_name(name)
+    if len(indices) == 0:
+        return None
+    elif len(indices) > 1:
+        print(f"Which '{name}'?")
+        for index in indices:
+            person_id = graph.person_ids[index]
+            name = graph.person_names[index]
+            birth = graph.person_births[index]
+            print(f"ID: {person_id}, Name: {name}, Birth: {birth}")
+        try:
+            index = graph.person_index(input("Intended Person ID: "))
+            if index in indices:
+                return index
+        except ValueError:
+            pass
+        return None
+    else:
+        return indices[0]
+
+
 def neighbors_for_person(person_id):
     """
     Returns (movie_id, person_id) pairs for people
@@ -177,5 +526,12 @@ def neighbors_for_person(person_id):
     return neighbors
 
 
+# Search strategies selectable from the command line
+SEARCHES = {
+    "bfs": shortest_path,
+    "bidirectional": shortest_path_bidirectional,
+}
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,135 @@
+import heapq
+import math
+
+from degrees import distances_from, neighbors_for_person
+
+
+def choose_landmarks(persons, degree, count=8):
+    """
+    Returns the `count` persons with the highest `degree`, which sit
+    close to most shortest paths in a star graph.
+    """
+    return heapq.nlargest(count, persons, key=degree)
+
+
+class LandmarkIndex():
+    """
+    Precomputed BFS trees from a few landmark people.
+
+    By the triangle inequality, for any landmark L:
+        |d(L, s) - d(L, t)| <= d(s, t) <= d(L, s) + d(L, t)
+    which gives instant bounds for any pair and lets exact searches
+    discard people who cannot lie on a shortest path.
+    """
+
+    def __init__(self, landmarks, neighbors=None):
+        if neighbors is None:
+            neighbors = neighbors_for_person
+        self.neighbors = neighbors
+        self.landmarks = list(landmarks)
+        # uma árvore de BFS por landmark: pessoa -> (distância, filme, pai)
+        self.trees = [distances_from(landmark, neighbors)
+                      for landmark in self.landmarks]
+
+    def bounds(self, source, target):
+        """
+        Returns (lower, upper) bounds on the degrees of separation
+        between source and target.
+
+        Both bounds are math.inf when some landmark proves the two are
+        not connected; the upper bound alone is math.inf when no
+        landmark reaches them.
+        """
+        lower, upper = 0, math.inf
+        for tree in self.trees:
+            source_entry = tree.get(source)
+            target_entry = tree.get(target)
+            if source_entry is None and target_entry is None:
+                continue
+            if source_entry is None or target_entry is None:
+                # o landmark alcança só um dos dois: componentes diferentes
+                return math.inf, math.inf
+            lower = max(lower, abs(source_entry[0] - target_entry[0]))
+            upper = min(upper, source_entry[0] + target_entry[0])
+        return lower, upper
+
+    def shortest_path(self, source, target):
+        """
+        Returns the shortest list of (movie_id, person_id) pairs
+        that connect the source to the target.
+
+        When the bounds meet, the path through the best landmark is
+        returned without searching; otherwise a BFS from the source
+        skips everyone whose lower bound rules them out.
+
+        If no possible path, returns None.
+        """
+        if source == target:
+            return []
+        lower, upper = self.bounds(source, target)
+        if lower == math.inf:
+            return None
+        if lower == upper:
+            return self._path_through_landmark(source, target, upper)
+
+        pais = {source: None}
+        camada = [source]
+        profundidade = 0
+        while camada:
+            profundidade += 1
+            proxima = []
+            for ator in camada:
+                for filme, vizinho in self.neighbors(ator):
+                    if vizinho in pais:
+                        continue
+                    pais[vizinho] = (filme, ator)
+                    if vizinho == target:
+                        return _path_from_parents(pais, target)
+
+                    # só continua por quem ainda pode estar num caminho mínimo
+                    if profundidade + self.bounds(vizinho, target)[0] <= upper:
+                        proxima.append(vizinho)
+            camada = proxima
+        return None
+
+    def _path_through_landmark(self, source, target, length):
+        """
+        Joins source -> landmark -> target using the tree of a landmark
+        whose distances add up to `length`.
+        """
+        for tree in self.trees:
+            source_entry = tree.get(source)
+            target_entry = tree.get(target)
+            if source_entry is None or target_entry is None:
+                continue
+            if source_entry[0] + target_entry[0] != length:
+                continue
+
+            # do "source" subindo a árvore até o landmark
+            resultado = []
+            _, filme, pai = source_entry
+            while pai is not None:
+                resultado.append((filme, pai))
+                _, filme, pai = tree[pai]
+
+            # do landmark descendo a árvore até o "target"
+            descida = []
+            ator = target
+            _, filme, pai = target_entry
+            while pai is not None:
+                descida.append((filme, ator))
+                ator = pai
+                _, filme, pai = tree[ator]
+            descida.reverse()
+            return resultado + descida
+        return None
+
+
+def _path_from_parents(pais, target):
+    resultado = []
+    while pais[target] is not None:
+        filme, anterior = pais[target]
+        resultado.append((filme, target))
+        target = anterior
+    resultado.reverse()
+    return resultado
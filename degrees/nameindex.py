@@ -0,0 +1,200 @@
+import math
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+# Approximate matches verified per fuzzy query
+CANDIDATES = 64
+
+
+class NameIndex():
+    """
+    Search index over people's names.
+
+    Names are kept lowercased and sorted, so prefix queries are two
+    binary searches, and every name is listed under each of its
+    trigrams for approximate matching.
+    """
+
+    def __init__(self, pairs):
+        """
+        Builds the index from (name, person) pairs; a person can be an
+        IMDB id or a CompactGraph index.
+        """
+        people = {}
+        for name, person in pairs:
+            people.setdefault(name.lower(), []).append(person)
+        self.names = sorted(people)
+        self.people = [tuple(people[name]) for name in self.names]
+
+        # trigrama -> posições em self.names dos nomes que o contêm
+        self.trigrams = {}
+        for position, name in enumerate(self.names):
+            for trigram in _trigrams(name):
+                postings = self.trigrams.get(trigram)
+                if postings is None:
+                    postings = self.trigrams[trigram] = array("i")
+                postings.append(position)
+
+    @classmethod
+    def from_tables(cls, names, people_offsets, people,
+                    trigrams, trigram_offsets, postings):
+        """
+        Rebuilds an index from the flat tables returned by `tables`,
+        for instance memory-mapped from a snapshot. `names` and
+        `trigrams` can be any sorted sequences of strings.
+        """
+        index = cls.__new__(cls)
+        index.names = names
+        index.people = _Slices(people_offsets, people, tuple)
+        index.trigrams = _Postings(trigrams,
+                                   _Slices(trigram_offsets, postings))
+        return index
+
+    def tables(self):
+        """
+        Returns the index as flat tables (names, people_offsets, people,
+        trigrams, trigram_offsets, postings): the people of `names[i]`
+        are `people[people_offsets[i]:people_offsets[i + 1]]`, and
+        likewise for the postings of each sorted trigram. Only for an
+        index built from pairs whose people are integers.
+        """
+        people_offsets = array("i", [0])
+        people = array("i")
+        for group in self.people:
+            people.extend(group)
+            people_offsets.append(len(people))
+
+        trigrams = sorted(self.trigrams)
+        trigram_offsets = array("i", [0])
+        postings = array("i")
+        for trigram in trigrams:
+            postings.extend(self.trigrams[trigram])
+            trigram_offsets.append(len(postings))
+        return (self.names, people_offsets, people,
+                trigrams, trigram_offsets, postings)
+
+    def __len__(self):
+        return len(self.names)
+
+    def exact(self, name):
+        """
+        Returns the people with exactly this name, ignoring case.
+        """
+        name = name.lower()
+        i = bisect_left(self.names, name)
+        if i < len(self.names) and self.names[i] == name:
+            return self.people[i]
+        return ()
+
+    def prefix(self, prefix, limit=10):
+        """
+        Returns up to `limit` (name, people) pairs whose name starts
+        with `prefix`, in alphabetical order.
+        """
+        prefix = prefix.lower()
+        start = bisect_left(self.names, prefix)
+        end = min(bisect_left(self.names, prefix + "\uffff"), start + limit)
+        return [(self.names[i], self.people[i]) for i in range(start, end)]
+
+    def fuzzy(self, name, limit=10, similarity=0.5):
+        """
+        Returns up to `limit` (score, name, people) tuples for names
+        whose trigram similarity to `name` is at least `similarity`,
+        best first.
+        """
+        name = name.lower()
+        query = _trigrams(name)
+        if not query:
+            return []
+
+        # Dice >= similarity exige pelo menos similarity * n / (2 - similarity)
+        # trigramas em comum, e um nome com `minimum` trigramas em comum
+        # precisa ter algum dos (n - minimum + 1) trigramas mais raros
+        minimum = max(1, math.ceil(similarity * len(query) / (2 - similarity)))
+        postings = sorted(
+            (self.trigrams.get(trigram, ()) for trigram in query), key=len
+        )
+        counts = Counter()
+        for positions in postings[:len(query) - minimum + 1]:
+            counts.update(positions)
+
+        # só confere os nomes que mais aparecem nas listas raras
+        candidates = [position for position, _ in
+                      counts.most_common(max(CANDIDATES, 4 * limit))]
+
+        results = []
+        for position in candidates:
+            candidate = self.names[position]
+            grams = _trigrams(candidate)
+            score = 2 * len(query & grams) / (len(query) + len(grams))
+            if score >= similarity:
+                results.append((score, candidate, self.people[position]))
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results[:limit]
+
+    def search(self, name, limit=10):
+        """
+        Returns up to `limit` ranked (score, name, people) candidates for
+        what the user typed: the exact name first, then names starting
+        with it, then approximate matches.
+        """
+        results = []
+        seen = set()
+        for match, people in self.prefix(name, limit):
+            score = 1.0 if match == name.lower() else 0.99
+            results.append((score, match, people))
+            seen.add(match)
+        for result in self.fuzzy(name, limit):
+            if len(results) >= limit:
+                break
+            if result[1] not in seen:
+                results.append(result)
+                seen.add(result[1])
+        results.sort(key=lambda result: (-result[0], result[1]))
+        return results
+
+
+class _Slices():
+    """
+    Read-only sequence whose item i is `values[offsets[i]:offsets[i + 1]]`,
+    passed through `convert` if given.
+    """
+
+    def __init__(self, offsets, values, convert=None):
+        self.offsets = offsets
+        self.values = values
+        self.convert = convert
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        values = self.values[self.offsets[i]:self.offsets[i + 1]]
+        return self.convert(values) if self.convert else values
+
+
+class _Postings():
+    """
+    Read-only mapping from sorted trigrams to their postings, with the
+    `get` method NameIndex uses on its dict of postings.
+    """
+
+    def __init__(self, trigrams, postings):
+        self.trigrams = trigrams
+        self.postings = postings
+
+    def get(self, trigram, default=None):
+        i = bisect_left(self.trigrams, trigram)
+        if i < len(self.trigrams) and self.trigrams[i] == trigram:
+            return self.postings[i]
+        return default
+
+
+def _trigrams(name):
+    """
+    Returns the set of trigrams of a name, padded so that the start and
+    end of each word count.
+    """
+    padded = f"  {' '.join(name.split())} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
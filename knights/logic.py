@@ -15,6 +15,11 @@ class Sentence():
         """Returns a set of all symbols in the logical sentence."""
         return set()
 
+    def table(self, columns, full):
+        """Returns the truth table of the logical sentence as an integer:
+        bit i is its value in model i (see `truth_columns`)."""
+        raise Exception("nothing to evaluate")
+
     @classmethod
     def validate(cls, sentence):
         if not isinstance(sentence, Sentence):
@@ -68,6 +73,9 @@ class Symbol(Sentence):
     def symbols(self):
         return {self.name}
 
+    def table(self, columns, full):
+        return columns[self.name]
+
 
 class Not(Sentence):
     def __init__(self, operand):
@@ -92,6 +100,9 @@ class Not(Sentence):
     def symbols(self):
         return self.operand.symbols()
 
+    def table(self, columns, full):
+        return full ^ self.operand.table(columns, full)
+
 
 class And(Sentence):
     def __init__(self, *conjuncts):
@@ -129,6 +140,12 @@ class And(Sentence):
     def symbols(self):
         return set.union(*[conjunct.symbols() for conjunct in self.conjuncts])
 
+    def table(self, columns, full):
+        result = full
+        for conjunct in self.conjuncts:
+            result &= conjunct.table(columns, full)
+        return result
+
 
 class Or(Sentence):
     def __init__(self, *disjuncts):
@@ -160,6 +177,12 @@ class Or(Sentence):
     def symbols(self):
         return set.union(*[disjunct.symbols() for disjunct in self.disjuncts])
 
+    def table(self, columns, full):
+        result = 0
+        for disjunct in self.disjuncts:
+            result |= disjunct.table(columns, full)
+        return result
+
 
 class Implication(Sentence):
     def __init__(self, antecedent, consequent):
@@ -191,6 +214,10 @@ class Implication(Sentence):
     def symbols(self):
         return set.union(self.antecedent.symbols(), self.consequent.symbols())
 
+    def table(self, columns, full):
+        return ((full ^ self.antecedent.table(columns, full))
+                | self.consequent.table(columns, full))
+
 
 class Biconditional(Sentence):
     def __init__(self, left, right):
@@ -224,40 +251,77 @@ class Biconditional(Sentence):
     def symbols(self):
         return set.union(self.left.symbols(), self.right.symbols())
 
+    def table(self, columns, full):
+        return full ^ (self.left.table(columns, full)
+                       ^ self.right.table(columns, full))
+
+
+# Acima disso a tabela verdade (2^n bits por subfórmula) ocupa memória
+# demais e model_check passa para o resolvedor SAT de sat.py
+MAX_TABLE_SYMBOLS = 24
+
+
+def truth_columns(symbols):
+    """Returns the truth table columns of the symbols, and the integer with
+    all 2^n model bits set.
+
+    Model i makes the k-th symbol true when bit k of i is set, so its
+    column repeats 2^k zeros followed by 2^k ones; each column is built
+    by doubling that block until it covers all 2^n models."""
+    size = 1 << len(symbols)
+    full = (1 << size) - 1
+    columns = {}
+    for k, symbol in enumerate(symbols):
+        width = 1 << k
+        column = ((1 << width) - 1) << width
+        width *= 2
+        while width < size:
+            column |= column << width
+            width *= 2
+        columns[symbol] = column
+    return columns, full
+
+
+def model_check_table(knowledge, query):
+    """Checks if knowledge base entails query, evaluating both over all
+    models at once as bitwise operations on their truth tables."""
+    symbols = sorted(set.union(knowledge.symbols(), query.symbols()))
+    columns, full = truth_columns(symbols)
+    knowledge = knowledge.table(columns, full)
+    query = query.table(columns, full)
+    # nenhum modelo em que a base é verdadeira e a consulta é falsa
+    return knowledge & ~query == 0
+
+
+def model_check_many(knowledge, queries):
+    """Checks which queries the knowledge base entails, building its truth
+    table, or its SAT encoding above MAX_TABLE_SYMBOLS, only once."""
+    queries = list(queries)
+    symbols = set.union(knowledge.symbols(),
+                        *[query.symbols() for query in queries])
+
+    if len(symbols) <= MAX_TABLE_SYMBOLS:
+        columns, full = truth_columns(sorted(symbols))
+        knowledge = knowledge.table(columns, full)
+        return [knowledge & ~query.table(columns, full) == 0
+                for query in queries]
+
+    # Otherwise encode the knowledge base once for the SAT solver
+    import sat
+    knowledge = sat.KnowledgeBase(knowledge)
+    return [knowledge.entails(query) for query in queries]
+
 
 def model_check(knowledge, query):
     """Checks if knowledge base entails query."""
 
-    def check_all(knowledge, query, symbols, model):
-        """Checks if knowledge base entails query, given a particular model."""
-
-        # If model has an assignment for each symbol
-        if not symbols:
-
-            # If knowledge base is true in model, then query must also be true
-            if knowledge.evaluate(model):
-                return query.evaluate(model)
-            return True
-        else:
-
-            # Choose one of the remaining unused symbols
-            remaining = symbols.copy()
-            p = remaining.pop()
-
-            # Create a model where the symbol is true
-            model_true = model.copy()
-            model_true[p] = True
-
-            # Create a model where the symbol is false
-            model_false = model.copy()
-            model_false[p] = False
-
-            # Ensure entailment holds in both models
-            return (check_all(knowledge, query, remaining, model_true) and
-                    check_all(knowledge, query, remaining, model_false))
-
     # Get all symbols in both knowledge and query
     symbols = set.union(knowledge.symbols(), query.symbols())
 
-    # Check that knowledge entails query
-    return check_all(knowledge, query, symbols, dict())
+    # Evaluate the whole truth table at once when it is small enough
+    if len(symbols) <= MAX_TABLE_SYMBOLS:
+        return model_check_table(knowledge, query)
+
+    # Otherwise search for a model that refutes the query
+    import sat
+    return sat.model_check(knowledge, query)
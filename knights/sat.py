@@ -0,0 +1,386 @@
+import heapq
+from collections import defaultdict
+
+from logic import And, Biconditional, Implication, Not, Or, Symbol
+
+
+class CNF():
+    """Clauses over variables 1..count; the literal -v is the negation of v.
+
+    Sentences are added through a Tseitin encoding: every compound
+    subsentence gets a fresh variable equivalent to it, so the number of
+    clauses grows linearly with the size of the sentence.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.variables = {}
+        self.clauses = []
+        self.definitions = {}
+        self.true = None
+
+    def variable(self, name):
+        """Returns the variable of a symbol name."""
+        if name not in self.variables:
+            self.count += 1
+            self.variables[name] = self.count
+        return self.variables[name]
+
+    def fresh(self):
+        """Returns a new auxiliary variable."""
+        self.count += 1
+        return self.count
+
+    def constant(self, value):
+        """Returns a literal that is always `value`."""
+        if self.true is None:
+            self.true = self.fresh()
+            self.clauses.append([self.true])
+        return self.true if value else -self.true
+
+    def literal(self, sentence):
+        """Returns a literal equivalent to the sentence."""
+        if isinstance(sentence, Symbol):
+            return self.variable(sentence.name)
+        if isinstance(sentence, Not):
+            return -self.literal(sentence.operand)
+        if sentence in self.definitions:
+            return self.definitions[sentence]
+
+        if isinstance(sentence, And):
+            literal = self._conjunction([self.literal(conjunct)
+                                         for conjunct in sentence.conjuncts])
+        elif isinstance(sentence, Or):
+            literal = -self._conjunction([-self.literal(disjunct)
+                                          for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            literal = -self._conjunction([self.literal(sentence.antecedent),
+                                          -self.literal(sentence.consequent)])
+        elif isinstance(sentence, Biconditional):
+            left = self.literal(sentence.left)
+            right = self.literal(sentence.right)
+            literal = self.fresh()
+            self.clauses.extend([
+                [-literal, -left, right], [-literal, left, -right],
+                [literal, left, right], [literal, -left, -right],
+            ])
+        else:
+            raise TypeError(f"cannot encode {sentence!r}")
+        self.definitions[sentence] = literal
+        return literal
+
+    def _conjunction(self, literals):
+        """Returns a literal equivalent to the conjunction of literals."""
+        if not literals:
+            return self.constant(True)
+        if len(literals) == 1:
+            return literals[0]
+        v = self.fresh()
+        for literal in literals:
+            self.clauses.append([-v, literal])
+        self.clauses.append([v] + [-literal for literal in literals])
+        return v
+
+    def add(self, sentence):
+        """Adds the sentence as a fact."""
+        if isinstance(sentence, And):
+            for conjunct in sentence.conjuncts:
+                self.add(conjunct)
+        elif isinstance(sentence, Or):
+            self.clauses.append([self.literal(disjunct)
+                                 for disjunct in sentence.disjuncts])
+        elif isinstance(sentence, Implication):
+            self.clauses.append([-self.literal(sentence.antecedent),
+                                 self.literal(sentence.consequent)])
+        else:
+            self.clauses.append([self.literal(sentence)])
+
+
+class Solver():
+    """CDCL: unit propagation on two watched literals per clause, clause
+    learning at the first unique implication point, non-chronological
+    backtracking, VSIDS decisions and restarts.
+
+    Learnt clauses follow from the original ones, so `solve` can be called
+    again with other assumptions and keeps what it has learnt.
+    """
+
+    def __init__(self, count, clauses):
+        self.count = 0
+        self.value = [0]
+        self.level = [0]
+        self.reason = [None]
+        self.phase = [-1]
+        self.activity = [0.0]
+        self.increment = 1.0
+        self.heap = []
+        self.trail = []
+        self.limits = []
+        self.head = 0
+        self.watches = {}
+        self.learnt = 0
+        self.conflicts = 0
+        self.unsatisfiable = False
+        self.add(count, clauses)
+
+    def add(self, count, clauses):
+        """Adds clauses over variables 1..count, which may be more than the
+        solver had before."""
+        self._backtrack(0)
+        for v in range(self.count + 1, count + 1):
+            self.value.append(0)
+            self.level.append(0)
+            self.reason.append(None)
+            self.phase.append(-1)
+            self.activity.append(0.0)
+            heapq.heappush(self.heap, (0.0, v))
+        self.count = max(self.count, count)
+
+        for clause in clauses:
+            # remove repetições e cláusulas sempre verdadeiras
+            clause = list(dict.fromkeys(clause))
+            if any(-literal in clause for literal in clause):
+                continue
+            # e o que já está decidido no nível 0, onde nada é desfeito
+            if any(self._state(literal) > 0 for literal in clause):
+                continue
+            clause = [literal for literal in clause if self._state(literal) == 0]
+            if not clause:
+                self.unsatisfiable = True
+            elif len(clause) == 1:
+                self._enqueue(clause[0], None)
+            else:
+                self._watch(clause)
+            if self.unsatisfiable or self._propagate() is not None:
+                self.unsatisfiable = True
+                return
+
+    def solve(self, assumptions=()):
+        """Returns a satisfying model {variable: bool} in which every
+        assumed literal is true, or None."""
+        self._backtrack(0)
+        if self.unsatisfiable:
+            return None
+        restart = 100
+        conflicts = 0
+        while True:
+            conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.limits:
+                    self.unsatisfiable = True
+                    return None
+                learnt, level = self._analyze(conflict)
+                self._backtrack(level)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], None)
+                else:
+                    self._watch(learnt)
+                    self.learnt += 1
+                    self._enqueue(learnt[0], learnt)
+                self.increment /= 0.95
+                continue
+
+            if conflicts >= restart:
+                conflicts = 0
+                restart = int(restart * 1.5)
+                self._backtrack(0)
+                continue
+
+            # as suposições são as primeiras decisões
+            literal = None
+            while len(self.limits) < len(assumptions):
+                assumed = assumptions[len(self.limits)]
+                state = self._state(assumed)
+                if state < 0:
+                    return None
+                self.limits.append(len(self.trail))
+                if state == 0:
+                    literal = assumed
+                    break
+            if literal is None:
+                v = self._pick()
+                if v is None:
+                    model = {v: self.value[v] > 0
+                             for v in range(1, self.count + 1)}
+                    self._backtrack(0)
+                    return model
+                self.limits.append(len(self.trail))
+                literal = v if self.phase[v] > 0 else -v
+            self._enqueue(literal, None)
+
+    def _state(self, literal):
+        """Returns 1 if the literal is true, -1 if false, 0 if unassigned."""
+        value = self.value[abs(literal)]
+        return value if literal > 0 else -value
+
+    def _enqueue(self, literal, reason):
+        state = self._state(literal)
+        if state:
+            return state > 0
+        v = abs(literal)
+        self.value[v] = 1 if literal > 0 else -1
+        self.level[v] = len(self.limits)
+        self.reason[v] = reason
+        self.trail.append(literal)
+        return True
+
+    def _watch(self, clause):
+        for literal in clause[:2]:
+            self.watches.setdefault(literal, []).append(clause)
+
+    def _backtrack(self, level):
+        if len(self.limits) <= level:
+            return
+        position = self.limits[level]
+        for literal in self.trail[position:]:
+            v = abs(literal)
+            self.phase[v] = self.value[v]
+            self.value[v] = 0
+            self.reason[v] = None
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[position:]
+        del self.limits[level:]
+        self.head = min(self.head, position)
+
+    def _pick(self):
+        """Returns the unassigned variable of highest activity, or None."""
+        heap = self.heap
+        while heap:
+            _, v = heapq.heappop(heap)
+            if not self.value[v]:
+                return v
+        return None
+
+    def _propagate(self):
+        """Assigns every implied literal; returns a conflicting clause or
+        None."""
+        watches = self.watches
+        value = self.value
+        while self.head < len(self.trail):
+            false_literal = -self.trail[self.head]
+            self.head += 1
+            watching = watches.get(false_literal)
+            if not watching:
+                continue
+            kept = []
+            for i, clause in enumerate(watching):
+                if clause[0] == false_literal:
+                    clause[0], clause[1] = clause[1], clause[0]
+                other = clause[0]
+                if value[abs(other)] == (1 if other > 0 else -1):
+                    kept.append(clause)
+                    continue
+                # procura outro literal não falso para vigiar
+                for k in range(2, len(clause)):
+                    literal = clause[k]
+                    if value[abs(literal)] != (-1 if literal > 0 else 1):
+                        clause[1], clause[k] = literal, false_literal
+                        watches.setdefault(literal, []).append(clause)
+                        break
+                else:
+                    kept.append(clause)
+                    if value[abs(other)]:
+                        # todos os literais são falsos
+                        kept.extend(watching[i + 1:])
+                        watches[false_literal] = kept
+                        return clause
+                    self._enqueue(other, clause)
+            watches[false_literal] = kept
+        return None
+
+    def _analyze(self, conflict):
+        """Returns the clause learnt from a conflict, with its asserting
+        literal first, and the level to backtrack to."""
+        level = len(self.limits)
+        seen = set()
+        learnt = [None]
+        pending = 0
+        literal = None
+        index = len(self.trail) - 1
+        clause = conflict
+        while True:
+            for q in clause:
+                v = abs(q)
+                if q == literal or v in seen or self.level[v] == 0:
+                    continue
+                seen.add(v)
+                self._bump(v)
+                if self.level[v] == level:
+                    pending += 1
+                else:
+                    learnt.append(q)
+            # próximo literal do nível atual no trail
+            while abs(self.trail[index]) not in seen:
+                index -= 1
+            literal = self.trail[index]
+            index -= 1
+            pending -= 1
+            if pending == 0:
+                break
+            clause = self.reason[abs(literal)]
+        learnt[0] = -literal
+
+        if len(learnt) == 1:
+            return learnt, 0
+        # o segundo literal vigiado é o de nível mais alto depois do primeiro
+        best = max(range(1, len(learnt)),
+                   key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _bump(self, v):
+        self.activity[v] += self.increment
+        if self.activity[v] > 1e100:
+            for u in range(1, self.count + 1):
+                self.activity[u] *= 1e-100
+            self.increment *= 1e-100
+        if not self.value[v]:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+
+def model_check(knowledge, query):
+    """Checks if knowledge base entails query, by showing that the knowledge
+    base together with the negated query has no model."""
+    cnf = CNF()
+    cnf.add(knowledge)
+    query = cnf.literal(query)
+    return Solver(cnf.count, cnf.clauses).solve([-query]) is None
+
+
+class KnowledgeBase():
+    """A knowledge base encoded once, answering many entailment queries.
+
+    Each model found while refuting a query is kept: a later query that is
+    false in one of them is not entailed, without calling the solver.
+    Symbols the knowledge base does not mention are false in these models.
+    """
+
+    def __init__(self, knowledge):
+        self.cnf = CNF()
+        self.cnf.add(knowledge)
+        self.solver = Solver(self.cnf.count, self.cnf.clauses)
+        self.encoded = len(self.cnf.clauses)
+        self.models = []
+        self.solves = 0
+
+    def entails(self, query):
+        """Checks if the knowledge base entails query."""
+        for model in self.models:
+            if not query.evaluate(model):
+                return False
+
+        literal = self.cnf.literal(query)
+        # definições novas criadas pela codificação da consulta
+        self.solver.add(self.cnf.count, self.cnf.clauses[self.encoded:])
+        self.encoded = len(self.cnf.clauses)
+        self.solves += 1
+        model = self.solver.solve([-literal])
+        if model is None:
+            return True
+        self.models.append(defaultdict(bool, {
+            name: model[v] for name, v in self.cnf.variables.items()
+        }))
+        return False
+
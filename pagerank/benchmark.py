@@ -0,0 +1,156 @@
+"""
+Benchmarks do PageRank.
+
+- `solvers`: compara os métodos de `engine.SOLVERS` nos corpora de
+  exemplo e em grafos sintéticos com links em lei de potência.
+- `suite`: gera corpora HTML de vários tamanhos (ver `generate.py`) e
+  mede tempo e pico de memória de `crawl`, `crawl_graph`,
+  `sample_pagerank` e `iterate_pagerank`. Com `--baseline`, termina com
+  erro se alguma medida piorar além de `--threshold`.
+
+Uso: python benchmark.py solvers [--sizes N ...] [--tolerance T]
+     python benchmark.py suite [--sizes N ...] [--baseline FILE] [--save FILE]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from crawler import crawl_graph
+from engine import Graph, SOLVERS, solve
+from generate import powerlaw_corpus, write_corpus
+from pagerank import DAMPING, crawl, iterate_pagerank, sample_pagerank
+
+# Corpora de exemplo incluídos no repositório
+CORPORA = ("corpus0", "corpus1", "corpus2")
+
+# Tempos abaixo disso são ruído demais para acusar regressão
+MIN_SECONDS = 0.01
+
+
+def compare(name, graph, tolerance):
+    """
+    Roda todos os métodos sobre `graph` e imprime iterações, tempo e a
+    distância L1 até uma solução de referência bem convergida.
+    """
+    reference, _ = solve(graph, DAMPING, "power", tolerance=1e-14)
+    print(f"{name} ({len(graph)} pages, {len(graph.targets)} links)")
+    for method in SOLVERS:
+        rank, report = solve(graph, DAMPING, method, tolerance=tolerance)
+        error = sum(abs(a - b) for a, b in zip(rank, reference))
+        print(f"  {method:>12}: {report.iterations:4} iterations "
+              f"{report.seconds:8.4f}s  residual {report.residuals[-1]:.1e}  "
+              f"error {error:.1e}")
+
+
+def run_solvers(args):
+    for directory in CORPORA:
+        compare(directory, Graph.from_corpus(crawl(directory)), args.tolerance)
+    for size in args.sizes:
+        graph = Graph.from_corpus(powerlaw_corpus(size))
+        compare(f"power-law {size}", graph, args.tolerance)
+
+
+def measure(function, *args, repeat=3):
+    """
+    Retorna o menor tempo de `repeat` execuções de `function(*args)` e o
+    pico de memória alocada (em KiB) numa execução extra sob
+    `tracemalloc`, que só enxerga o processo atual.
+    """
+    seconds = min(_timed(function, *args) for _ in range(repeat))
+    tracemalloc.start()
+    try:
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": seconds, "peak_kib": peak / 1024}
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def run_suite(args):
+    results = {}
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            write_corpus(powerlaw_corpus(size), directory)
+            corpus = crawl(directory)
+            stages = {
+                "crawl": (crawl, directory),
+                "crawl_graph": (crawl_graph, directory),
+                "sample": (sample_pagerank, corpus, DAMPING, args.samples),
+                "iterate": (iterate_pagerank, corpus, DAMPING),
+            }
+            for stage, (function, *function_args) in stages.items():
+                key = f"{size}/{stage}"
+                results[key] = measure(function, *function_args,
+                                       repeat=args.repeat)
+                print(f"{key:>20}: {results[key]['seconds']:9.4f}s "
+                      f"{results[key]['peak_kib']:12.1f} KiB")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+def find_regressions(results, baseline, threshold):
+    """
+    Lista as medidas de `results` que pioraram mais que `threshold`
+    (fração) em relação às mesmas medidas de `baseline`.
+    """
+    regressions = []
+    for key, measures in sorted(results.items()):
+        for name, value in measures.items():
+            previous = baseline.get(key, {}).get(name)
+            if name == "seconds" and (previous or 0) < MIN_SECONDS:
+                continue
+            if previous and value > previous * (1 + threshold):
+                regressions.append(
+                    f"{key} {name}: {previous:.4g} -> {value:.4g}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    solvers = commands.add_parser("solvers")
+    solvers.add_argument("--sizes", type=int, nargs="*",
+                         default=[1000, 10000, 100000])
+    solvers.add_argument("--tolerance", type=float, default=1e-8)
+    solvers.set_defaults(run=run_solvers)
+
+    suite = commands.add_parser("suite")
+    suite.add_argument("--sizes", type=int, nargs="*",
+                       default=[100, 1000, 10000])
+    suite.add_argument("--samples", type=int, default=100000)
+    suite.add_argument("--repeat", type=int, default=3)
+    suite.add_argument("--baseline", help="JSON results to compare against")
+    suite.add_argument("--save", help="write results to this JSON file")
+    suite.add_argument("--threshold", type=float, default=0.25,
+                       help="allowed slowdown or memory growth (fraction)")
+    suite.set_defaults(run=run_suite)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
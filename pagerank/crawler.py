@@ -0,0 +1,100 @@
+"""
+Leitura paralela e em fluxo de um diretório de páginas HTML.
+
+Cada arquivo é lido em blocos e entregue a um `HTMLParser`, de modo que
+nenhum arquivo precisa estar inteiro na memória. As páginas são
+numeradas em ordem alfabética e os links saem direto como um `Graph`
+(ver `engine.py`), pronto para os motores de PageRank.
+"""
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+
+from engine import Graph
+
+# Tamanho dos blocos lidos de cada arquivo
+CHUNK_SIZE = 64 * 1024
+
+
+class LinkParser(HTMLParser):
+    """
+    Coleta o `href` de cada tag `<a>` de um documento HTML.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = set()
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        for name, value in attrs:
+            if name == "href" and value is not None:
+                self.links.add(value)
+
+
+def parse_links(path, chunk_size=CHUNK_SIZE):
+    """
+    Retorna o conjunto de links de um arquivo HTML, lido em blocos.
+    """
+    parser = LinkParser()
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    parser.close()
+    return parser.links
+
+
+def crawl_links(directory, workers=None):
+    """
+    Lê todas as páginas `.html` de um diretório em paralelo.
+
+    Retorna a lista ordenada de páginas e um gerador que produz, para
+    cada página em ordem, os índices ordenados das páginas do corpus
+    para as quais ela aponta (sem auto-referências).
+    """
+    pages = sorted(
+        filename for filename in os.listdir(directory)
+        if filename.endswith(".html")
+    )
+    index = {page: i for i, page in enumerate(pages)}
+    paths = [os.path.join(directory, page) for page in pages]
+
+    def links():
+        if workers == 1:
+            results = map(parse_links, paths)
+            yield from _intern(results, index)
+            return
+        count = workers or os.cpu_count() or 1
+        chunksize = max(1, len(paths) // (8 * count))
+        with ProcessPoolExecutor(count) as pool:
+            results = pool.map(parse_links, paths, chunksize=chunksize)
+            yield from _intern(results, index)
+
+    return pages, links()
+
+
+def _intern(results, index):
+    for source, links in enumerate(results):
+        targets = {index[link] for link in links if link in index}
+        targets.discard(source)
+        yield sorted(targets)
+
+
+def crawl_graph(directory, workers=None):
+    """
+    Lê um diretório de arquivos HTML e retorna o grafo de links entre
+    as páginas, no formato consumido pelos motores de PageRank.
+    """
+    pages, links = crawl_links(directory, workers)
+    offsets = array("l", [0])
+    targets = array("l")
+    for page_targets in links:
+        targets.extend(page_targets)
+        offsets.append(len(targets))
+    return Graph(pages, offsets, targets)
@@ -0,0 +1,356 @@
+"""
+Motor de PageRank sobre um grafo esparso.
+
+O corpus é convertido uma única vez para um grafo com páginas numeradas
+e links em formato CSR; cada iteração do método das potências custa
+então O(páginas + links). Se o NumPy estiver instalado, as iterações são
+vetorizadas; caso contrário, o mesmo cálculo é feito em Python puro.
+"""
+
+import time
+from array import array
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class Graph():
+    """
+    Grafo de links com páginas numeradas de 0 a n-1.
+
+    Os links da página `u` são `targets[offsets[u]:offsets[u + 1]]`.
+    """
+
+    def __init__(self, pages, offsets, targets):
+        self.pages = pages
+        self.offsets = offsets
+        self.targets = targets
+        self.outdegree = array(
+            "l", (offsets[u + 1] - offsets[u] for u in range(len(pages)))
+        )
+        # páginas sem links, tratadas como se ligassem para todas
+        self.dangling = array(
+            "l", (u for u in range(len(pages)) if self.outdegree[u] == 0)
+        )
+
+    def __len__(self):
+        return len(self.pages)
+
+    @classmethod
+    def from_corpus(cls, corpus):
+        """
+        Constrói o grafo a partir do dicionário devolvido por `crawl`.
+        """
+        pages = sorted(corpus)
+        index = {page: i for i, page in enumerate(pages)}
+        offsets = array("l", [0])
+        targets = array("l")
+        for page in pages:
+            targets.extend(sorted(index[link] for link in corpus[page]))
+            offsets.append(len(targets))
+        return cls(pages, offsets, targets)
+
+    @classmethod
+    def from_edges(cls, pages, edges):
+        """
+        Constrói o grafo a partir dos nomes das páginas e de pares
+        (origem, destino) de índices, em qualquer ordem.
+        """
+        links = [set() for _ in pages]
+        for source, target in edges:
+            if source != target:
+                links[source].add(target)
+        offsets = array("l", [0])
+        targets = array("l")
+        for page_links in links:
+            targets.extend(sorted(page_links))
+            offsets.append(len(targets))
+        return cls(list(pages), offsets, targets)
+
+    def incoming(self):
+        """
+        Retorna os links de entrada em formato CSR: as páginas que
+        apontam para `v` são `sources[offsets[v]:offsets[v + 1]]`.
+        """
+        n = len(self.pages)
+        offsets = array("l", [0]) * (n + 1)
+        for target in self.targets:
+            offsets[target + 1] += 1
+        for v in range(n):
+            offsets[v + 1] += offsets[v]
+        cursor = array("l", offsets[:-1])
+        sources = array("l", [0]) * len(self.targets)
+        for u in range(n):
+            for i in range(self.offsets[u], self.offsets[u + 1]):
+                target = self.targets[i]
+                sources[cursor[target]] = u
+                cursor[target] += 1
+        return offsets, sources
+
+    def ranks(self, vector):
+        """
+        Converte um vetor de PageRank no dicionário {página: rank}.
+        """
+        return {page: float(vector[i]) for i, page in enumerate(self.pages)}
+
+
+def power_iteration(graph, damping_factor, tolerance=0.001,
+                    max_iterations=1000):
+    """
+    Calcula o vetor de PageRank pelo método das potências.
+
+    - Páginas sem links distribuem seu rank igualmente entre todas as
+      páginas; essa parcela é somada de uma vez a cada iteração.
+    - Para quando nenhuma página muda mais que `tolerance` ou após
+      `max_iterations` iterações.
+    """
+    if numpy is not None:
+        return _power_iteration_numpy(graph, damping_factor, tolerance,
+                                      max_iterations)
+
+    n = len(graph)
+    rank = [1 / n] * n
+    for _ in range(max_iterations):
+        new_rank = step(graph, rank, damping_factor)
+        converged = all(
+            abs(new_rank[i] - rank[i]) < tolerance for i in range(n)
+        )
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+
+def step(graph, rank, damping_factor):
+    """
+    Aplica uma iteração do PageRank ao vetor `rank`, em Python puro.
+    """
+    n = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+
+    # parcela uniforme: teletransporte mais o rank das páginas sem links
+    dangling = sum(rank[u] for u in graph.dangling)
+    base = (1 - damping_factor) / n + damping_factor * dangling / n
+    new_rank = [base] * n
+
+    for u in range(n):
+        start, end = offsets[u], offsets[u + 1]
+        if start == end:
+            continue
+        share = damping_factor * rank[u] / (end - start)
+        for i in range(start, end):
+            new_rank[targets[i]] += share
+    return new_rank
+
+
+def _power_iteration_numpy(graph, damping_factor, tolerance, max_iterations):
+    n = len(graph)
+    outdegree = numpy.asarray(graph.outdegree, dtype=numpy.float64)
+    targets = numpy.asarray(graph.targets, dtype=numpy.int64)
+    # origem de cada link, na mesma ordem de `targets`
+    sources = numpy.repeat(numpy.arange(n), graph.outdegree)
+    dangling = numpy.asarray(graph.dangling, dtype=numpy.int64)
+    divisor = numpy.where(outdegree > 0, outdegree, 1)
+
+    rank = numpy.full(n, 1 / n)
+    for _ in range(max_iterations):
+        base = (1 - damping_factor) / n + damping_factor * rank[dangling].sum() / n
+        share = damping_factor * rank / divisor
+        new_rank = numpy.bincount(targets, weights=share[sources], minlength=n)
+        new_rank += base
+        converged = numpy.abs(new_rank - rank).max() < tolerance
+        rank = new_rank
+        if converged:
+            break
+    return rank
+
+
+class SolverReport():
+    """
+    Diagnóstico de uma execução de `solve`: o método usado, o número de
+    iterações, o resíduo L1 (soma das mudanças) de cada iteração e o
+    tempo total em segundos.
+    """
+
+    def __init__(self, method):
+        self.method = method
+        self.iterations = 0
+        self.residuals = []
+        self.seconds = 0.0
+
+    def __repr__(self):
+        residual = self.residuals[-1] if self.residuals else None
+        return (f"SolverReport(method={self.method!r}, "
+                f"iterations={self.iterations}, residual={residual}, "
+                f"seconds={self.seconds:.4f})")
+
+    def record(self, residual):
+        self.iterations += 1
+        self.residuals.append(residual)
+
+
+def solve(graph, damping_factor, method="power", tolerance=1e-8,
+          max_iterations=1000):
+    """
+    Calcula o vetor de PageRank com o método escolhido em `SOLVERS`.
+
+    Para quando o resíduo L1 de uma iteração fica abaixo de `tolerance`
+    ou após `max_iterations` iterações. Retorna o vetor (somando 1) e um
+    `SolverReport`. Todos os métodos rodam em Python puro, para que a
+    comparação entre eles seja justa.
+    """
+    try:
+        solver = SOLVERS[method]
+    except KeyError:
+        raise ValueError(f"unknown solver: {method}")
+    report = SolverReport(method)
+    start = time.perf_counter()
+    rank = solver(graph, damping_factor, tolerance, max_iterations, report)
+    total = sum(rank)
+    rank = [value / total for value in rank]
+    report.seconds = time.perf_counter() - start
+    return rank, report
+
+
+def _solve_power(graph, damping_factor, tolerance, max_iterations, report):
+    n = len(graph)
+    rank = [1 / n] * n
+    for _ in range(max_iterations):
+        new_rank = step(graph, rank, damping_factor)
+        residual = sum(abs(new_rank[i] - rank[i]) for i in range(n))
+        rank = new_rank
+        report.record(residual)
+        if residual < tolerance:
+            break
+    return rank
+
+
+def _solve_gauss_seidel(graph, damping_factor, tolerance, max_iterations,
+                        report):
+    """
+    Gauss-Seidel: cada página é atualizada já usando os valores novos
+    das páginas calculadas antes dela na mesma iteração.
+    """
+    n = len(graph)
+    in_offsets, in_sources = graph.incoming()
+    outdegree = graph.outdegree
+    is_dangling = [False] * n
+    for u in graph.dangling:
+        is_dangling[u] = True
+
+    rank = [1 / n] * n
+    teleport = (1 - damping_factor) / n
+    dangling = sum(rank[u] for u in graph.dangling)
+    for _ in range(max_iterations):
+        residual = 0.0
+        for v in range(n):
+            total = teleport + damping_factor * dangling / n
+            for i in range(in_offsets[v], in_offsets[v + 1]):
+                u = in_sources[i]
+                total += damping_factor * rank[u] / outdegree[u]
+            change = total - rank[v]
+            if is_dangling[v]:
+                dangling += change
+            rank[v] = total
+            residual += abs(change)
+
+        # a solução soma 1; reescalar a cada varredura elimina o modo
+        # lento em que só a massa total ainda está convergindo
+        total = sum(rank)
+        rank = [value / total for value in rank]
+        dangling = sum(rank[u] for u in graph.dangling)
+        report.record(residual)
+        if residual < tolerance:
+            break
+    return rank
+
+
+def _solve_aitken(graph, damping_factor, tolerance, max_iterations, report,
+                  period=10):
+    """
+    Método das potências com extrapolação de Aitken (delta ao quadrado),
+    aplicada página a página a cada `period` iterações.
+    """
+    n = len(graph)
+    history = [[1 / n] * n]
+    for iteration in range(1, max_iterations + 1):
+        rank = history[-1]
+        new_rank = step(graph, rank, damping_factor)
+        residual = sum(abs(new_rank[i] - rank[i]) for i in range(n))
+        report.record(residual)
+        if residual < tolerance:
+            return new_rank
+        history = (history + [new_rank])[-3:]
+
+        if iteration % period == 0 and len(history) == 3:
+            x0, x1, x2 = history
+            extrapolated = list(x2)
+            for i in range(n):
+                denominator = x2[i] - 2 * x1[i] + x0[i]
+                if abs(denominator) > 1e-15:
+                    value = x2[i] - (x2[i] - x1[i]) ** 2 / denominator
+                    if value > 0:
+                        extrapolated[i] = value
+            total = sum(extrapolated)
+            history = [[value / total for value in extrapolated]]
+    return history[-1]
+
+
+def _solve_adaptive(graph, damping_factor, tolerance, max_iterations, report,
+                    period=10):
+    """
+    PageRank adaptativo: páginas cuja mudança fica abaixo de
+    `tolerance / n` são congeladas e deixam de ser recalculadas. A cada
+    `period` iterações todas as páginas são recalculadas, o que
+    descongela as que pararam cedo demais; só uma dessas varreduras
+    completas pode encerrar o método.
+    """
+    n = len(graph)
+    in_offsets, in_sources = graph.incoming()
+    outdegree = graph.outdegree
+    page_tolerance = tolerance / n
+
+    rank = [1 / n] * n
+    active = list(range(n))
+    full = True
+    for iteration in range(1, max_iterations + 1):
+        pages = range(n) if full else active
+        dangling = sum(rank[u] for u in graph.dangling)
+        base = (1 - damping_factor) / n + damping_factor * dangling / n
+        updates = []
+        for v in pages:
+            total = base
+            for i in range(in_offsets[v], in_offsets[v + 1]):
+                u = in_sources[i]
+                total += damping_factor * rank[u] / outdegree[u]
+            updates.append((v, total))
+
+        residual = 0.0
+        active = []
+        for v, total in updates:
+            change = abs(total - rank[v])
+            rank[v] = total
+            residual += change
+            if change >= page_tolerance:
+                active.append(v)
+        report.record(residual)
+
+        if residual < tolerance or not active:
+            if full:
+                break
+            full = True
+        else:
+            full = iteration % period == 0
+    return rank
+
+
+# Métodos disponíveis em `solve`, por nome
+SOLVERS = {
+    "power": _solve_power,
+    "gauss-seidel": _solve_gauss_seidel,
+    "aitken": _solve_aitken,
+    "adaptive": _solve_adaptive,
+}
@@ -0,0 +1,193 @@
+"""
+PageRank fora da memória, sobre um arquivo binário de links.
+
+O corpus é lido em fluxo (ver `crawler.py`) e gravado como um arquivo
+de links ordenados por origem e destino; o dicionário de `crawl` nunca
+é montado. Cada iteração percorre esse arquivo em blocos e só os
+vetores de rank ficam abertos, como arrays de floats mapeados em
+memória. As somas seguem a ordem do caminho que `engine.power_iteration`
+usa: a de `engine.step` em Python puro ou, com NumPy, a soma do NumPy
+sobre as páginas sem links e os links somados a partir de zero, como faz
+`bincount`. Assim o resultado é idêntico ao de `iterate_pagerank` nos
+dois casos.
+
+Uso: python external.py corpus [edge_file]
+"""
+
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+import engine
+from crawler import crawl_links
+from pagerank import DAMPING
+
+# Cabeçalho: identificação, versão, número de páginas e de links
+HEADER = struct.Struct("<8sIxxxxqq")
+MAGIC = b"PRLINKS\0"
+VERSION = 1
+
+# Links lidos por bloco em cada iteração
+BLOCK_EDGES = 1 << 16
+
+
+def write_edge_file(directory, path, workers=None):
+    """
+    Lê as páginas HTML de `directory` e grava em `path` o grafo de links:
+    o cabeçalho, o número de links de cada página (int32) e os pares
+    (origem, destino) de int32, ordenados. Os nomes das páginas vão, um
+    por linha, para `path + ".pages"`.
+
+    Retorna o número de páginas e de links.
+    """
+    pages, links = crawl_links(directory, workers)
+    with open(f"{path}.pages", "w", encoding="utf-8") as f:
+        for page in pages:
+            f.write(page + "\n")
+
+    outdegree = array("i", [0]) * len(pages)
+    edges = 0
+    with open(path, "wb") as f:
+        f.write(bytes(HEADER.size + outdegree.itemsize * len(pages)))
+        pair = array("i")
+        for source, targets in enumerate(links):
+            outdegree[source] = len(targets)
+            edges += len(targets)
+            for target in targets:
+                pair.extend((source, target))
+            if len(pair) >= 2 * BLOCK_EDGES:
+                pair.tofile(f)
+                del pair[:]
+        pair.tofile(f)
+
+        # cabeçalho e graus só são conhecidos no final
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(pages), edges))
+        outdegree.tofile(f)
+    return len(pages), edges
+
+
+def read_pages(path):
+    """
+    Produz os nomes das páginas de um arquivo de links, em ordem.
+    """
+    with open(f"{path}.pages", encoding="utf-8") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def external_pagerank(path, damping_factor, rank_path, tolerance=0.001,
+                      max_iterations=1000, block_edges=BLOCK_EDGES):
+    """
+    Calcula o PageRank do arquivo de links `path`, com o mesmo critério
+    de parada de `engine.power_iteration`, e grava o vetor final em
+    `rank_path` como float64 na ordem das páginas.
+    """
+    with open(path, "rb") as f:
+        magic, version, n, edges = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"not a link file: {path}")
+    start = HEADER.size + 4 * n
+
+    with open(path, "rb") as f, \
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+            tempfile.TemporaryDirectory() as scratch:
+        outdegree = memoryview(data)[HEADER.size:start].cast("i")
+        dangling = [u for u in range(n) if outdegree[u] == 0]
+        if engine.numpy is not None:
+            dangling = engine.numpy.array(dangling, dtype=engine.numpy.int64)
+        rank, rank_map = _float_file(rank_path, n)
+        new_rank, new_map = _float_file(os.path.join(scratch, "rank"), n)
+        try:
+            for i in range(n):
+                rank[i] = 1 / n
+            for _ in range(max_iterations):
+                converged = _step(data, start, edges, outdegree, dangling,
+                                  rank, new_rank, damping_factor, tolerance,
+                                  block_edges)
+                # o vetor novo passa a ser o atual
+                rank[:] = new_rank
+                if converged:
+                    break
+            rank_map.flush()
+        finally:
+            del outdegree, rank, new_rank
+            rank_map.close()
+            new_map.close()
+
+
+def _step(data, start, edges, outdegree, dangling, rank, new_rank,
+          damping_factor, tolerance, block_edges):
+    """
+    Aplica uma iteração, lendo os links em blocos, e diz se nenhuma
+    página mudou mais que `tolerance`.
+    """
+    n = len(rank)
+    numpy = engine.numpy
+    # parcela uniforme: teletransporte mais o rank das páginas sem links
+    if numpy is None:
+        total = sum(rank[u] for u in dangling)
+    else:
+        total = numpy.asarray(rank)[dangling].sum()
+    base = (1 - damping_factor) / n + damping_factor * total / n
+    # com NumPy, bincount soma os links a partir de zero e a parcela
+    # uniforme entra depois
+    first = base if numpy is None else 0.0
+    for i in range(n):
+        new_rank[i] = first
+
+    source, share = -1, 0.0
+    for block in range(0, edges, block_edges):
+        count = min(block_edges, edges - block)
+        offset = start + 8 * block
+        pairs = memoryview(data)[offset:offset + 8 * count].cast("i")
+        for i in range(0, 2 * count, 2):
+            if pairs[i] != source:
+                source = pairs[i]
+                share = damping_factor * rank[source] / outdegree[source]
+            new_rank[pairs[i + 1]] += share
+        pairs.release()
+    if numpy is not None:
+        for i in range(n):
+            new_rank[i] += base
+
+    return all(abs(new_rank[i] - rank[i]) < tolerance for i in range(n))
+
+
+def _float_file(path, n):
+    """
+    Cria um arquivo de `n` float64 e o devolve mapeado em memória.
+    """
+    with open(path, "wb+") as f:
+        f.truncate(8 * max(n, 1))
+        mapped = mmap.mmap(f.fileno(), 0)
+    return memoryview(mapped).cast("d")[:n], mapped
+
+
+def main():
+    if len(sys.argv) not in (2, 3):
+        sys.exit("Usage: python external.py corpus [edge_file]")
+    directory = sys.argv[1]
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if len(sys.argv) == 3:
+            path = sys.argv[2]
+        else:
+            path = os.path.join(scratch, "links")
+        write_edge_file(directory, path)
+        rank_path = os.path.join(scratch, "ranks")
+        external_pagerank(path, DAMPING, rank_path)
+
+        ranks = array("d")
+        with open(rank_path, "rb") as f:
+            ranks.frombytes(f.read())
+        print("PageRank Results from External Iteration")
+        for page, rank in sorted(zip(read_pages(path), ranks)):
+            print(f"  {page}: {rank:.4f}")
+
+
+if __name__ == "__main__":
+    main()
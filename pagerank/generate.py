@@ -0,0 +1,81 @@
+"""
+Gera corpora sintéticos de páginas HTML com links em lei de potência,
+no mesmo formato de `corpus0`-`corpus2`.
+
+Uso: python generate.py directory pages [--links L] [--dangling F] [--seed S]
+"""
+
+import argparse
+import os
+import random
+
+# Modelo de cada página gerada
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+    <head>
+        <title>{name}</title>
+    </head>
+    <body>
+        <h1>{name}</h1>
+
+        <div>Links:</div>
+        <ul>
+{links}
+        </ul>
+    </body>
+</html>
+"""
+LINK = '            <li><a href="{page}">{name}</a></li>'
+
+
+def powerlaw_corpus(n, links=4, dangling=0.1, seed=0):
+    """
+    Gera um corpus de `n` páginas por ligação preferencial: cada página
+    nova aponta para até `links` páginas já existentes, escolhidas com
+    probabilidade proporcional ao número de links que elas já recebem
+    (mais um). Uma fração `dangling` das páginas fica sem links.
+    """
+    rng = random.Random(seed)
+    pages = [f"{i}.html" for i in range(n)]
+    corpus = {page: set() for page in pages}
+    # cada página aparece uma vez por link recebido, mais uma vez
+    urn = []
+    for i, page in enumerate(pages):
+        if i and rng.random() >= dangling:
+            targets = {rng.choice(urn) for _ in range(min(links, i))}
+            corpus[page] = {pages[target] for target in targets}
+            urn.extend(targets)
+        urn.append(i)
+    return corpus
+
+
+def write_corpus(corpus, directory):
+    """
+    Escreve cada página do corpus como um arquivo HTML em `directory`.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for page, page_links in corpus.items():
+        links = "\n".join(
+            LINK.format(page=link, name=link[:-len(".html")])
+            for link in sorted(page_links)
+        )
+        with open(os.path.join(directory, page), "w") as f:
+            f.write(PAGE.format(name=page[:-len(".html")], links=links))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("directory")
+    parser.add_argument("pages", type=int)
+    parser.add_argument("--links", type=int, default=4)
+    parser.add_argument("--dangling", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpus = powerlaw_corpus(args.pages, args.links, args.dangling, args.seed)
+    write_corpus(corpus, args.directory)
+    print(f"Wrote {len(corpus)} pages to {args.directory}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,10 @@
 import os
-import random
 import re
 import sys
 
+from engine import Graph, power_iteration
+from sampling import sample_counts
+
 # Definição de constantes
 DAMPING = 0.85  # Fator de amortecimento para o algoritmo de PageRank
 SAMPLES = 10000  # Número de amostras para o método de amostragem
@@ -85,65 +87,33 @@ def sample_pagerank(corpus, damping_factor, n):
     Retorna os valores de PageRank estimados por meio de amostragem de `n` páginas.
     
     - Escolhe uma página inicial aleatória.
-    - Usa o modelo de transição para determinar a próxima página a ser visitada.
+    - A cada passo segue um link aleatório da página atual com probabilidade
+      `damping_factor` e, caso contrário (ou se a página não tiver links),
+      vai para qualquer página do corpus; é a mesma distribuição de
+      `transition_model`, sorteada em O(1) (ver `sampling.py`).
     - Repete esse processo `n` vezes e calcula a frequência relativa das visitas.
     """
-    rank = {pagina: 0 for pagina in corpus}  # Inicializa as contagens de visita para cada página
-
-    pagina = random.choice(list(corpus.keys()))  # Escolhe uma página inicial aleatória
-
-    for _ in range(n):
-        rank[pagina] += 1  # Conta a visita à página atual
-        model = transition_model(corpus, pagina, damping_factor)  # Obtém o modelo de transição
-        paginas = list(model.keys())
-        probabilidades = list(model.values())
-
-        if not paginas or not probabilidades:  # Caso não haja páginas válidas, encerra o loop
-            break
-
-        # Escolhe a próxima página baseada nas probabilidades
-        pagina = random.choices(paginas, probabilidades)[0]  
+    graph = Graph.from_corpus(corpus)
+    counts = sample_counts(graph, damping_factor, n)
 
     # Normaliza os valores para que a soma seja 1
-    total = sum(rank.values())
-    for pagina in rank:
-        rank[pagina] /= total
-    
-    return rank
+    total = sum(counts)
+    return {page: counts[i] / total for i, page in enumerate(graph.pages)}
 
 
-def iterate_pagerank(corpus, damping_factor):
+def iterate_pagerank(corpus, damping_factor, tolerance=0.001,
+                     max_iterations=1000):
     """
     Retorna os valores de PageRank por meio de um processo iterativo até convergência.
     
+    - Converte o corpus uma única vez para um grafo esparso (ver `engine.py`).
     - Começa atribuindo valores iniciais iguais a todas as páginas.
-    - Atualiza os valores de PageRank iterativamente até que a variação seja menor que um limite `threshold`.
+    - Atualiza os valores de PageRank iterativamente até que nenhuma página
+      mude mais que `tolerance`, ou até `max_iterations` iterações.
     """
-    # Inicializa com valores iguais para todas as páginas
-    rank = {page: 1 / len(corpus) for page in corpus}  
-    threshold = 0.001  # Define o critério de convergência
-
-    while True:
-        new_rank = {}  # Novo dicionário para armazenar os valores atualizados
-        for pagina in corpus:
-            total = (1 - damping_factor) / len(corpus)  # Parcela fixa do cálculo
-
-            for link_page in corpus:
-                if pagina in corpus[link_page]:  # Se a página recebe links de outra
-                    total += damping_factor * (rank[link_page] / len(corpus[link_page]))
-
-                if not corpus[link_page]:  # Caso uma página não tenha links, considera link para todas
-                    total += damping_factor * (rank[link_page] / len(corpus))
-
-            new_rank[pagina] = total  # Atualiza o novo valor de PageRank
-
-        # Verifica se houve convergência (mudanças pequenas o suficiente)
-        if all(abs(new_rank[p] - rank[p]) < threshold for p in rank):
-            break
-
-        rank = new_rank.copy()  # Atualiza os valores para a próxima iteração
-
-    return rank  # Retorna os valores finais de PageRank
+    graph = Graph.from_corpus(corpus)
+    rank = power_iteration(graph, damping_factor, tolerance, max_iterations)
+    return graph.ranks(rank)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,189 @@
+"""
+Algoritmos de PageRank por "push", que só visitam a vizinhança das
+páginas onde ainda há resíduo a propagar.
+
+Todos trabalham direto sobre o dicionário devolvido por `crawl`.
+"""
+
+import heapq
+from collections import deque
+
+
+def diff_corpus(old, new):
+    """
+    Compara dois corpora devolvidos por `crawl`.
+
+    Retorna um dicionário com os conjuntos `added_pages`,
+    `removed_pages`, `added_links` e `removed_links` (pares
+    (origem, destino)). Os links de páginas removidas contam como
+    removidos e os de páginas novas, como adicionados.
+    """
+    diff = {
+        "added_pages": set(new) - set(old),
+        "removed_pages": set(old) - set(new),
+        "added_links": set(),
+        "removed_links": set(),
+    }
+    for page in set(old) | set(new):
+        old_links = old.get(page, set())
+        new_links = new.get(page, set())
+        if old_links == new_links:
+            continue
+        diff["added_links"].update((page, link) for link in new_links - old_links)
+        diff["removed_links"].update((page, link) for link in old_links - new_links)
+    return diff
+
+
+def update_pagerank(corpus, ranks, diff, damping_factor, tolerance=1e-4):
+    """
+    Atualiza os valores de PageRank depois de uma mudança no corpus.
+
+    - `corpus` é o corpus novo, `ranks` o PageRank do corpus antigo e
+      `diff` as mudanças entre os dois (ver `diff_corpus`).
+    - Parte de `ranks` e calcula só o resíduo causado pelas páginas cujos
+      links mudaram; esse resíduo é propagado pelo método de
+      Gauss-Southwell, sempre a partir da página de maior resíduo, até
+      que nenhuma página tenha resíduo acima de `tolerance` vezes a
+      parcela de teletransporte.
+
+    A precisão do resultado é limitada pela de `ranks`.
+    """
+    old_count = len(ranks)
+    added = _by_source(diff["added_links"])
+    removed = _by_source(diff["removed_links"])
+
+    def old_links(page):
+        """Links que `page` tinha no corpus antigo."""
+        if page in diff["removed_pages"]:
+            links = set()
+        else:
+            links = corpus[page] - added.get(page, set())
+        return links | removed.get(page, set())
+
+    def was_dangling(page):
+        if page in added or page in removed or page in diff["removed_pages"]:
+            return not old_links(page)
+        return not corpus[page]
+
+    # lado direito do sistema (I - d M) y = kappa * 1, cuja solução é
+    # proporcional ao PageRank: a parcela uniforme (teletransporte mais
+    # páginas sem links) que cada página recebia no corpus antigo
+    dangling = sum(value for page, value in ranks.items() if was_dangling(page))
+    kappa = (1 - damping_factor + damping_factor * dangling) / old_count
+    threshold = tolerance * (1 - damping_factor) / old_count
+
+    rank = dict(ranks)
+    for page in diff["removed_pages"]:
+        rank.pop(page, None)
+    residual = {}
+    for page in diff["added_pages"]:
+        rank[page] = 0
+        residual[page] = kappa
+
+    # páginas cuja contribuição para os vizinhos mudou
+    for page in set(added) | set(removed):
+        old_rank = ranks.get(page)
+        if old_rank is None:
+            continue
+        links = old_links(page)
+        if links:
+            share = damping_factor * old_rank / len(links)
+            for link in links:
+                if link in corpus:
+                    residual[link] = residual.get(link, 0) - share
+        links = corpus.get(page)
+        if links:
+            share = damping_factor * old_rank / len(links)
+            for link in links:
+                residual[link] = residual.get(link, 0) + share
+
+    # A parcela uniforme do resíduo (teletransporte e páginas sem links)
+    # não é propagada: a solução muda só por um fator de escala, que a
+    # normalização final remove.
+    heap = [(-abs(value), page) for page, value in residual.items()
+            if abs(value) > threshold]
+    heapq.heapify(heap)
+    while heap:
+        _, page = heapq.heappop(heap)
+        amount = residual.get(page, 0)
+        if abs(amount) <= threshold:
+            continue
+        residual[page] = 0
+        rank[page] += amount
+
+        links = corpus[page]
+        if not links:
+            continue
+        share = damping_factor * amount / len(links)
+        for link in links:
+            value = residual.get(link, 0) + share
+            residual[link] = value
+            if abs(value) > threshold:
+                heapq.heappush(heap, (-abs(value), link))
+
+    total = sum(rank.values())
+    return {page: value / total for page, value in rank.items()}
+
+
+def _by_source(links):
+    grouped = {}
+    for source, link in links:
+        grouped.setdefault(source, set()).add(link)
+    return grouped
+
+
+def forward_push(corpus, seed, damping_factor, epsilon=1e-4):
+    """
+    Estima o PageRank personalizado de `seed` (uma página ou uma coleção
+    de páginas, para onde o surfista se teletransporta) por "forward
+    push", visitando só a vizinhança da semente.
+
+    Retorna as estimativas {página: valor} e a massa de resíduo que
+    sobrou: cada estimativa fica abaixo do valor exato por no máximo
+    essa massa. Páginas sem links devolvem o surfista à semente.
+    """
+    seeds = [seed] if isinstance(seed, str) else sorted(set(seed))
+    estimate = {}
+    residual = {page: 1 / len(seeds) for page in seeds}
+    queue = deque(seeds)
+    queued = set(seeds)
+
+    while queue:
+        page = queue.popleft()
+        queued.discard(page)
+        amount = residual[page]
+        links = corpus[page]
+        if amount <= epsilon * max(len(links), 1):
+            continue
+        residual[page] = 0
+        estimate[page] = estimate.get(page, 0) + (1 - damping_factor) * amount
+
+        # sem links, o surfista volta para a semente
+        targets = links if links else seeds
+        share = damping_factor * amount / len(targets)
+        for link in targets:
+            value = residual.get(link, 0) + share
+            residual[link] = value
+            if link not in queued and value > epsilon * max(len(corpus[link]), 1):
+                queue.append(link)
+                queued.add(link)
+
+    return estimate, sum(residual.values())
+
+
+def personalized_pagerank(corpus, seeds, damping_factor, k=10, epsilon=1e-4):
+    """
+    Retorna, para cada semente de `seeds`, as `k` páginas com maior
+    PageRank personalizado, como listas de (página, valor) em ordem
+    decrescente.
+
+    Cada semente pode ser uma página ou uma coleção de páginas; os
+    valores têm o erro limitado descrito em `forward_push`.
+    """
+    results = []
+    for seed in seeds:
+        estimate, _ = forward_push(corpus, seed, damping_factor, epsilon)
+        results.append(heapq.nlargest(
+            k, estimate.items(), key=lambda item: (item[1], item[0])
+        ))
+    return results
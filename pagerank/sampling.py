@@ -0,0 +1,103 @@
+"""
+Amostragem de PageRank em O(1) por passo.
+
+O modelo de transição de `transition_model` é uma mistura de duas
+distribuições uniformes: com probabilidade `damping_factor` o surfista
+segue um dos links da página (ou qualquer página, se ela não tiver
+links) e, caso contrário, se teletransporta para qualquer página. Cada
+passo precisa então de apenas dois números aleatórios, sem montar a
+distribuição de N páginas. Com NumPy, vários surfistas independentes
+andam ao mesmo tempo.
+"""
+
+import math
+import random
+
+from engine import numpy
+
+# Surfistas simultâneos na versão vetorizada
+WALKERS = 4096
+
+# Amostras mínimas por surfista na versão vetorizada
+MIN_STEPS = 100
+
+# Distância máxima até a distribuição do PageRank ao começar a contar
+BURN_IN_TOLERANCE = 1e-4
+
+
+def sample_counts(graph, damping_factor, n, walkers=WALKERS, seed=None):
+    """
+    Retorna quantas vezes cada página (por índice) foi visitada em `n`
+    amostras do surfista aleatório sobre `graph`.
+
+    O surfista começa numa página aleatória, que conta como sua primeira
+    amostra. Na versão com NumPy, que divide as amostras entre vários
+    surfistas, cada um anda antes `burn_in` passos sem contar.
+    """
+    if numpy is not None:
+        return _sample_counts_numpy(graph, damping_factor, n, walkers, seed)
+
+    rng = random.Random(seed)
+    uniform = rng.random
+    pages = len(graph)
+    offsets = graph.offsets
+    targets = graph.targets
+    outdegree = graph.outdegree
+
+    counts = [0] * pages
+    page = int(uniform() * pages)
+    for _ in range(n):
+        counts[page] += 1
+        links = outdegree[page]
+        if links and uniform() < damping_factor:
+            page = targets[offsets[page] + int(uniform() * links)]
+        else:
+            page = int(uniform() * pages)
+    return counts
+
+
+def burn_in(damping_factor, tolerance=BURN_IN_TOLERANCE):
+    """
+    Retorna quantos passos descartar antes de contar visitas: a cada
+    passo a distância (L1) até a distribuição do PageRank cai pelo menos
+    por um fator `damping_factor`, então após `log(tolerance) /
+    log(damping_factor)` passos ela fica abaixo de `tolerance`.
+    """
+    if not 0 < damping_factor < 1:
+        return 0
+    return math.ceil(math.log(tolerance) / math.log(damping_factor))
+
+
+def _sample_counts_numpy(graph, damping_factor, n, walkers, seed):
+    rng = numpy.random.default_rng(seed)
+    pages = len(graph)
+    offsets = numpy.asarray(graph.offsets, dtype=numpy.int64)
+    targets = numpy.asarray(graph.targets, dtype=numpy.int64)
+    outdegree = numpy.asarray(graph.outdegree, dtype=numpy.int64)
+
+    def step(page):
+        links = outdegree[page]
+        follow = numpy.flatnonzero(
+            (links > 0) & (rng.random(len(page)) < damping_factor)
+        )
+        choice = (rng.random(len(follow)) * links[follow]).astype(numpy.int64)
+        next_page = rng.integers(pages, size=len(page))
+        next_page[follow] = targets[offsets[page[follow]] + choice]
+        return next_page
+
+    # cada surfista precisa andar o bastante para se afastar do começo
+    # uniforme; os primeiros passos não contam
+    walkers = max(1, min(walkers, n // MIN_STEPS))
+    page = rng.integers(pages, size=walkers)
+    for _ in range(burn_in(damping_factor)):
+        page = step(page)
+
+    counts = numpy.zeros(pages, dtype=numpy.int64)
+    remaining = n
+    while remaining > 0:
+        # no último passo só parte dos surfistas ainda conta
+        visited = page if remaining >= walkers else page[:remaining]
+        counts += numpy.bincount(visited, minlength=pages)
+        remaining -= len(visited)
+        page = step(page)
+    return counts
@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import tictactoe as ttt
+
+
+def opening(moves):
+    """
+    Returns the board after playing `moves` from the initial state.
+    """
+    board = ttt.initial_state()
+    for move in moves:
+        board = ttt.result(board, move)
+    return board
+
+
+# Posições comparadas: tabuleiro vazio e algumas aberturas
+POSITIONS = {
+    "empty": (),
+    "corner": ((0, 0),),
+    "center": ((1, 1),),
+    "corner+edge": ((0, 0), (0, 1)),
+}
+
+
+def count_nodes(algorithm, board):
+    """
+    Runs `algorithm` on the board and returns its action, the number of
+    nodes visited and the elapsed time. Every search calls `terminal`
+    once per node, so counting those calls counts the nodes.
+    """
+    terminal = ttt.terminal
+    nodes = 0
+
+    def counting_terminal(board):
+        nonlocal nodes
+        nodes += 1
+        return terminal(board)
+
+    ttt.terminal = counting_terminal
+    try:
+        start = time.perf_counter()
+        action = algorithm(board)
+        elapsed = time.perf_counter() - start
+    finally:
+        ttt.terminal = terminal
+    return action, nodes, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python benchmark.py [--algorithms NAME ...]"
+    )
+    parser.add_argument("--algorithms", nargs="*", default=list(ttt.ALGORITHMS),
+                        choices=list(ttt.ALGORITHMS))
+    args = parser.parse_args()
+
+    for position, moves in POSITIONS.items():
+        board = opening(moves)
+        print(position)
+        values = set()
+        for name in args.algorithms:
+            algorithm = ttt.ALGORITHMS[name]
+            if algorithm is ttt.minimax_memo:
+                # tabela nova, para não aproveitar as buscas anteriores
+                table = ttt.TranspositionTable()
+                algorithm = lambda board: ttt.minimax_memo(board, table)
+            action, nodes, elapsed = count_nodes(algorithm, board)
+            values.add(ttt.TranspositionTable().value(ttt.result(board, action)))
+            print(f"  {name:>9}: {action} {nodes:8} nodes {elapsed:8.3f}s")
+
+        # os algoritmos podem escolher jogadas diferentes, mas de mesmo valor
+        if len(values) != 1:
+            raise SystemExit("Algorithms disagree on the value of the best move.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Tic Tac Toe Player on bitboards
+
+A position is a pair of 9-bit integers (x, o), one per player, where
+cell (i, j) is bit 3 * i + j. The functions ending in `_bits` work on
+that pair; the others are adapters with the same API as tictactoe.py,
+taking and returning list-of-lists boards.
+"""
+
+from functools import lru_cache
+
+from tictactoe import X, O, EMPTY
+
+FULL = 0b111111111
+
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+)
+
+# WINNING[bits] is 1 when the cells in `bits` contain a full line
+WINNING = bytes(
+    any(bits & mask == mask for mask in WIN_MASKS) for bits in range(1 << 9)
+)
+
+
+def to_bits(board):
+    """
+    Returns the (x, o) bitboards of a list-of-lists board.
+    """
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return x, o
+
+
+def to_board(x, o):
+    """
+    Returns the list-of-lists board of (x, o) bitboards.
+    """
+    return [[X if x >> (3 * i + j) & 1 else O if o >> (3 * i + j) & 1 else EMPTY
+             for j in range(3)]
+            for i in range(3)]
+
+
+def player_bits(x, o):
+    """
+    Returns player who has the next turn.
+    """
+    return X if x.bit_count() == o.bit_count() else O
+
+
+def moves_bits(x, o):
+    """
+    Yields the bit of every empty cell, lowest cell first.
+    """
+    free = FULL & ~(x | o)
+    while free:
+        move = free & -free
+        yield move
+        free ^= move
+
+
+def winner_bits(x, o):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    if WINNING[x]:
+        return X
+    if WINNING[o]:
+        return O
+    return None
+
+
+def terminal_bits(x, o):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return bool(WINNING[x] or WINNING[o] or (x | o) == FULL)
+
+
+@lru_cache(maxsize=None)
+def value_bits(x, o):
+    """
+    Returns the minimax value of a position: 1 if X wins with best play,
+    -1 if O wins, 0 for a tie.
+    """
+    if WINNING[x]:
+        return 1
+    if WINNING[o]:
+        return -1
+    if (x | o) == FULL:
+        return 0
+
+    if x.bit_count() == o.bit_count():
+        v = -1
+        for move in moves_bits(x, o):
+            v = max(v, value_bits(x | move, o))
+            # não existe valor melhor que uma vitória
+            if v == 1:
+                break
+    else:
+        v = 1
+        for move in moves_bits(x, o):
+            v = min(v, value_bits(x, o | move))
+            if v == -1:
+                break
+    return v
+
+
+def minimax_bits(x, o):
+    """
+    Returns the bit of the optimal move for the current player, or None
+    if the game is over.
+    """
+    if terminal_bits(x, o):
+        return None
+    if x.bit_count() == o.bit_count():
+        return max(moves_bits(x, o), key=lambda move: value_bits(x | move, o))
+    return min(moves_bits(x, o), key=lambda move: value_bits(x, o | move))
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+    return to_board(0, 0)
+
+
+def player(board):
+    """
+    Returns player who has the next turn on a board.
+    """
+    return player_bits(*to_bits(board))
+
+
+def actions(board):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+    return {divmod(move.bit_length() - 1, 3)
+            for move in moves_bits(*to_bits(board))}
+
+
+def result(board, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+    x, o = to_bits(board)
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3) or (x | o) >> (3 * i + j) & 1:
+        raise ValueError('invalid action')
+    move = 1 << (3 * i + j)
+    if player_bits(x, o) == X:
+        return to_board(x | move, o)
+    return to_board(x, o | move)
+
+
+def winner(board):
+    """
+    Returns the winner of the game, if there is one.
+    """
+    return winner_bits(*to_bits(board))
+
+
+def terminal(board):
+    """
+    Returns True if game is over, False otherwise.
+    """
+    return terminal_bits(*to_bits(board))
+
+
+def utility(board):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+    x, o = to_bits(board)
+    return 1 if WINNING[x] else -1 if WINNING[o] else 0
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    move = minimax_bits(*to_bits(board))
+    if move is None:
+        return None
+    return divmod(move.bit_length() - 1, 3)
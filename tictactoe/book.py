@@ -0,0 +1,192 @@
+"""
+Tic Tac Toe solution table
+
+The game is solved once and stored as one byte per board, indexed by
+the board read in base 3 (EMPTY = 0, X = 1, O = 2, cell (i, j) is digit
+3 * i + j). The low 4 bits of a byte are the best cell 3 * i + j, or
+NO_ACTION on terminal boards, and the next 2 bits are the minimax value
+plus 1. Unreachable boards hold UNREACHABLE.
+
+Usage: python book.py build [file]
+       python book.py verify [file] [--algorithm NAME]
+"""
+
+import argparse
+import os
+import sys
+
+import bitboard
+import tictactoe as ttt
+
+BOOK = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tictactoe.book")
+MAGIC = b"TTTBOOK1"
+
+NO_ACTION = 0b1111
+UNREACHABLE = 0xFF
+
+DIGITS = {ttt.EMPTY: 0, ttt.X: 1, ttt.O: 2}
+
+
+def key(board):
+    """
+    Returns the index of the board in the table.
+    """
+    k = 0
+    for i in (2, 1, 0):
+        for j in (2, 1, 0):
+            k = 3 * k + DIGITS[board[i][j]]
+    return k
+
+
+def build():
+    """
+    Solves every reachable board and returns the table as bytes.
+    """
+    table = bytearray([UNREACHABLE]) * 3 ** 9
+    pending = [(0, 0)]
+    while pending:
+        x, o = pending.pop()
+        k = sum(3 ** c * (1 if x >> c & 1 else 2)
+                for c in range(9) if (x | o) >> c & 1)
+        if table[k] != UNREACHABLE:
+            continue
+
+        value = bitboard.value_bits(x, o)
+        action = NO_ACTION
+        if not bitboard.terminal_bits(x, o):
+            children = {}
+            for move in bitboard.moves_bits(x, o):
+                child = (x | move, o) if bitboard.player_bits(x, o) == ttt.X \
+                    else (x, o | move)
+                children[move.bit_length() - 1] = child
+                pending.append(child)
+            # entre as jogadas ótimas, a primeira na ordem da poda alfa-beta
+            action = next(
+                3 * i + j for i, j in ttt.ORDEM
+                if 3 * i + j in children
+                and bitboard.value_bits(*children[3 * i + j]) == value
+            )
+        table[k] = (value + 1) << 4 | action
+    return bytes(table)
+
+
+def save(table, path=BOOK):
+    with open(path, "wb") as f:
+        f.write(MAGIC + table)
+
+
+def load(path=BOOK):
+    """
+    Returns the table stored in `path`, building and saving it first if
+    the file does not exist.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:
+        table = build()
+        try:
+            save(table, path)
+        except OSError:
+            # diretório somente leitura: segue sem salvar
+            pass
+        return table
+    if data[:len(MAGIC)] != MAGIC or len(data) != len(MAGIC) + 3 ** 9:
+        raise ValueError(f"not a tic-tac-toe book: {path}")
+    return data[len(MAGIC):]
+
+
+# tabela usada por `minimax` e `value`, carregada na primeira consulta
+table = None
+
+
+def lookup(board):
+    global table
+    if table is None:
+        table = load()
+    entry = table[key(board)]
+    if entry == UNREACHABLE:
+        raise ValueError("board is not reachable")
+    return entry
+
+
+def value(board):
+    """
+    Returns the minimax value of the board.
+    """
+    return (lookup(board) >> 4) - 1
+
+
+def minimax(board):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+    action = lookup(board) & NO_ACTION
+    if action == NO_ACTION:
+        return None
+    return divmod(action, 3)
+
+
+def verify(table, algorithm):
+    """
+    Compares the table with a live search on every reachable board: the
+    stored value must be the live value, and the stored action must be
+    as good as the action chosen by `algorithm`. Returns the boards that
+    disagree.
+    """
+    live = ttt.TranspositionTable()
+    errors = []
+    seen = set()
+    pending = [ttt.initial_state()]
+    while pending:
+        board = pending.pop()
+        k = key(board)
+        if k in seen:
+            continue
+        seen.add(k)
+
+        entry = table[k]
+        stored = (entry >> 4) - 1
+        action = entry & NO_ACTION
+        if ttt.terminal(board):
+            if entry == UNREACHABLE or stored != ttt.utility(board) \
+                    or action != NO_ACTION:
+                errors.append(board)
+            continue
+
+        # valores conferidos sem o cache de bitboard.py, que gerou a tabela
+        expected = live.value(ttt.result(board, algorithm(board)))
+        if entry == UNREACHABLE or action == NO_ACTION or stored != expected \
+                or live.value(ttt.result(board, divmod(action, 3))) != expected:
+            errors.append(board)
+        pending.extend(ttt.result(board, a) for a in ttt.actions(board))
+    return seen, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python book.py {build,verify} [file] [--algorithm NAME]"
+    )
+    parser.add_argument("command", choices=["build", "verify"])
+    parser.add_argument("file", nargs="?", default=BOOK)
+    parser.add_argument("--algorithm", default="minimax",
+                        choices=list(ttt.ALGORITHMS))
+    args = parser.parse_args()
+
+    if args.command == "build":
+        table = build()
+        save(table, args.file)
+        reachable = sum(entry != UNREACHABLE for entry in table)
+        print(f"Wrote {reachable} positions to {args.file}")
+    else:
+        seen, errors = verify(load(args.file), ttt.ALGORITHMS[args.algorithm])
+        for board in errors:
+            print(f"MISMATCH {board}")
+        print(f"Checked {len(seen)} positions against {args.algorithm}: "
+              f"{len(errors)} mismatches")
+        if errors:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
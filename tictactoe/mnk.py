@@ -0,0 +1,340 @@
+"""
+m,n,k-game: an m x n board where k in a row wins
+
+Tic-tac-toe is the 3,3,3-game. The board tracks every window of k
+consecutive cells (in rows, columns and both diagonals) with its count
+of X and O stones, updated only around the last move. That gives both
+the win check and a heuristic score without rescanning the board. The
+AI is an iterative-deepening alpha-beta search that returns the best
+move of the last depth completed within its time budget.
+
+Usage: python mnk.py [m n k] [--seconds S]
+"""
+
+import argparse
+import time
+
+from tictactoe import X, O, EMPTY
+
+# Valor de uma vitória, acima de qualquer avaliação heurística; vitórias
+# mais rápidas valem mais
+WIN = 10 ** 30
+
+# Nós visitados entre duas consultas ao relógio
+CHECK_EVERY = 256
+
+
+class Game():
+    """
+    The rules of one m,n,k-game: board size, windows and their weights.
+    The search only tries cells within `radius` of a stone; None tries
+    every empty cell, which keeps small boards exact.
+    """
+
+    def __init__(self, m, n, k, radius=1):
+        if not 0 < k <= max(m, n):
+            raise ValueError(f"no line of {k} fits on a {m}x{n} board")
+        self.m = m
+        self.n = n
+        self.k = k
+        self.radius = radius
+
+        # janelas de k casas, como tuplas de índices i * n + j
+        self.windows = []
+        for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            for i in range(m):
+                for j in range(n):
+                    last_i, last_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= last_i < m and 0 <= last_j < n:
+                        self.windows.append(tuple(
+                            (i + di * step) * n + j + dj * step
+                            for step in range(k)
+                        ))
+        # janelas que passam por cada casa
+        self.windows_of = [[] for _ in range(m * n)]
+        for w, window in enumerate(self.windows):
+            for cell in window:
+                self.windows_of[cell].append(w)
+        # peso de uma janela com c pedras de um só jogador
+        self.weights = [0] + [10 ** c for c in range(k - 1)] + [WIN]
+
+    def initial_state(self):
+        return Board(self)
+
+
+class Board():
+    """
+    A position of a Game, changed in place by `play` and `undo`.
+    """
+
+    def __init__(self, game):
+        self.game = game
+        self.cells = [EMPTY] * (game.m * game.n)
+        self.counts = {X: [0] * len(game.windows), O: [0] * len(game.windows)}
+        self.history = []
+        self.winner = None
+        # soma dos pesos das janelas: positiva favorece X
+        self.score = 0
+
+    @classmethod
+    def from_rows(cls, game, rows):
+        """
+        Returns the board with the stones of a list-of-lists board, which
+        may already be finished. Its history alternates the stones of X
+        and O row by row, not in the order they were played.
+        """
+        board = cls(game)
+        n = game.n
+        xs = [i * n + j for i, row in enumerate(rows)
+              for j, cell in enumerate(row) if cell == X]
+        os = [i * n + j for i, row in enumerate(rows)
+              for j, cell in enumerate(row) if cell == O]
+        if len(xs) - len(os) not in (0, 1):
+            raise ValueError("invalid board")
+        for t, cell in enumerate(xs):
+            board._place(cell, X)
+            if t < len(os):
+                board._place(os[t], O)
+        return board
+
+    def rows(self):
+        n = self.game.n
+        return [self.cells[i * n:(i + 1) * n] for i in range(self.game.m)]
+
+    def player(self):
+        """
+        Returns player who has the next turn.
+        """
+        return X if len(self.history) % 2 == 0 else O
+
+    def terminal(self):
+        return self.winner is not None or len(self.history) == len(self.cells)
+
+    def actions(self):
+        """
+        Returns all empty cells (i, j).
+        """
+        n = self.game.n
+        return [divmod(cell, n) for cell, value in enumerate(self.cells)
+                if value is EMPTY]
+
+    def play(self, action):
+        i, j = action
+        game = self.game
+        if not (0 <= i < game.m and 0 <= j < game.n):
+            raise ValueError("invalid action")
+        cell = i * game.n + j
+        if self.cells[cell] is not EMPTY or self.winner is not None:
+            raise ValueError("invalid action")
+
+        self._place(cell, self.player())
+
+    def _place(self, cell, jogador):
+        """
+        Puts a stone on the cell, updating windows, score and winner.
+        """
+        game = self.game
+        adversario = O if jogador == X else X
+        sign = 1 if jogador == X else -1
+        mine, theirs = self.counts[jogador], self.counts[adversario]
+        weights = game.weights
+        for w in game.windows_of[cell]:
+            # só janelas sem pedras do adversário contam
+            if theirs[w] == 0:
+                self.score += sign * (weights[mine[w] + 1] - weights[mine[w]])
+                if mine[w] + 1 == game.k:
+                    self.winner = jogador
+            elif mine[w] == 0:
+                # a janela deixa de ser útil para o adversário
+                self.score += sign * weights[theirs[w]]
+            mine[w] += 1
+        self.cells[cell] = jogador
+        self.history.append(cell)
+
+    def undo(self):
+        cell = self.history.pop()
+        jogador = self.cells[cell]
+        adversario = O if jogador == X else X
+        sign = 1 if jogador == X else -1
+        mine, theirs = self.counts[jogador], self.counts[adversario]
+        weights = self.game.weights
+        for w in self.game.windows_of[cell]:
+            mine[w] -= 1
+            if theirs[w] == 0:
+                self.score -= sign * (weights[mine[w] + 1] - weights[mine[w]])
+            elif mine[w] == 0:
+                self.score -= sign * weights[theirs[w]]
+        self.cells[cell] = EMPTY
+        self.winner = None
+
+    def evaluate(self):
+        """
+        Returns the heuristic score for the player to move.
+        """
+        return self.score if self.player() == X else -self.score
+
+    def candidates(self):
+        """
+        Returns the empty cells within the game's radius of a stone (or
+        the center of an empty board), most promising first: cells in
+        many windows that are still open for either player.
+        """
+        game = self.game
+        m, n = game.m, game.n
+        r = game.radius
+        if r is None:
+            near = [cell for cell, value in enumerate(self.cells)
+                    if value is EMPTY]
+        elif not self.history:
+            return [(m // 2) * n + n // 2]
+        else:
+            near = set()
+            for cell in self.history:
+                i, j = divmod(cell, n)
+                for a in range(max(i - r, 0), min(i + r + 1, m)):
+                    for b in range(max(j - r, 0), min(j + r + 1, n)):
+                        if self.cells[a * n + b] is EMPTY:
+                            near.add(a * n + b)
+
+        weights = game.weights
+        xs, os = self.counts[X], self.counts[O]
+
+        def potential(cell):
+            total = 0
+            for w in game.windows_of[cell]:
+                if os[w] == 0:
+                    total += weights[xs[w] + 1]
+                if xs[w] == 0:
+                    total += weights[os[w] + 1]
+            return total
+
+        return sorted(near, key=lambda cell: (-potential(cell), cell))
+
+
+class Timeout(Exception):
+    pass
+
+
+class Search():
+    """
+    Iterative-deepening alpha-beta search with a time budget.
+    """
+
+    def __init__(self, board, seconds=1.0, max_depth=None):
+        self.board = board
+        self.deadline = time.perf_counter() + seconds
+        self.max_depth = max_depth or len(board.cells) - len(board.history)
+        self.nodes = 0
+        self.depth = 0
+
+    def best_move(self):
+        """
+        Returns the best action (i, j) found and its score for the player
+        to move, or (None, score) on a finished game.
+        """
+        board = self.board
+        if board.terminal():
+            return None, 0
+        moves = board.candidates()
+        best, score = moves[0], None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                move, value = self._root(moves, depth)
+            except Timeout:
+                break
+            best, score, self.depth = move, value, depth
+            # a melhor jogada da profundidade anterior é tentada primeiro
+            moves.remove(move)
+            moves.insert(0, move)
+            if abs(value) >= WIN - len(board.cells):
+                break
+        return divmod(best, board.game.n), score
+
+    def _root(self, moves, depth):
+        board = self.board
+        alpha, best = -WIN - 1, None
+        for cell in moves:
+            board.play(divmod(cell, board.game.n))
+            try:
+                value = -self._negamax(depth - 1, -WIN - 1, -alpha, 1)
+            finally:
+                board.undo()
+            if value > alpha:
+                alpha, best = value, cell
+        return best, alpha
+
+    def _negamax(self, depth, alpha, beta, ply):
+        self.nodes += 1
+        if self.nodes % CHECK_EVERY == 0 and time.perf_counter() > self.deadline:
+            raise Timeout
+
+        board = self.board
+        if board.winner is not None:
+            # quem acabou de jogar venceu
+            return -(WIN - ply)
+        if len(board.history) == len(board.cells):
+            return 0
+        if depth == 0:
+            return board.evaluate()
+
+        n = board.game.n
+        value = -WIN - 1
+        for cell in board.candidates():
+            board.play(divmod(cell, n))
+            try:
+                value = max(value, -self._negamax(depth - 1, -beta, -alpha,
+                                                  ply + 1))
+            finally:
+                board.undo()
+            alpha = max(alpha, value)
+            if alpha >= beta:
+                break
+        return value
+
+
+def best_move(board, seconds=1.0, max_depth=None):
+    """
+    Returns the best action (i, j) for the player to move on a Board
+    within `seconds`.
+    """
+    move, _ = Search(board, seconds, max_depth).best_move()
+    return move
+
+
+def minimax(board, seconds=1.0):
+    """
+    Returns the action for the current player on a 3x3 list-of-lists
+    board, with the same interface as `tictactoe.minimax`.
+    """
+    return best_move(Board.from_rows(Game(3, 3, 3, radius=None), board),
+                     seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python mnk.py [m n k] [--seconds S]"
+    )
+    parser.add_argument("size", type=int, nargs="*", default=[7, 7, 5])
+    parser.add_argument("--seconds", type=float, default=1.0)
+    args = parser.parse_args()
+    if len(args.size) != 3:
+        parser.error("give m, n and k")
+
+    # partida da IA contra ela mesma
+    board = Game(*args.size).initial_state()
+    while not board.terminal():
+        search = Search(board, args.seconds)
+        start = time.perf_counter()
+        move, score = search.best_move()
+        elapsed = time.perf_counter() - start
+        print(f"{board.player()} plays {move}: depth {search.depth}, "
+              f"{search.nodes} nodes, {elapsed:.2f}s, score {score}")
+        board.play(move)
+
+    for row in board.rows():
+        print(" ".join(cell or "." for cell in row))
+    print(f"Winner: {board.winner}" if board.winner else "Tie")
+
+
+if __name__ == "__main__":
+    main()
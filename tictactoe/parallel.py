@@ -0,0 +1,129 @@
+"""
+Tic Tac Toe minimax split across processes
+
+The positions `split` plies below the root are searched in a process
+pool, and their values are backed up to the root in this process. Jobs
+are listed and merged in sorted action order, so the chosen action does
+not depend on which worker finishes first.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+
+import tictactoe as ttt
+from benchmark import count_nodes
+
+
+def minimax_value(board):
+    """
+    Returns the minimax value of the board by plain minimax.
+    """
+    if ttt.player(board) == ttt.X:
+        return ttt.maxvalue(board)
+    return ttt.minvalue(board)
+
+
+def alphabeta_value(board):
+    """
+    Returns the minimax value of the board by alpha-beta search.
+    """
+    return ttt.alphabeta_value(board, -10, 10)
+
+
+# Busca feita em cada processo, por nome
+VALUES = {"minimax": minimax_value, "alphabeta": alphabeta_value}
+
+
+def play(board, path):
+    for action in path:
+        board = ttt.result(board, action)
+    return board
+
+
+def split_paths(board, split):
+    """
+    Returns the sequences of actions leading `split` plies below the
+    board, stopping early at finished games, in sorted order.
+    """
+    paths = [()]
+    for _ in range(split):
+        deeper = []
+        for path in paths:
+            position = play(board, path)
+            if ttt.terminal(position):
+                deeper.append(path)
+            else:
+                deeper.extend(path + (action,)
+                              for action in sorted(ttt.actions(position)))
+        paths = deeper
+    return paths
+
+
+def _search(job):
+    """
+    Evaluates one job in a worker: returns its value and the number of
+    nodes visited.
+    """
+    board, search = job
+    value, nodes, _ = count_nodes(VALUES[search], board)
+    return value, nodes
+
+
+def _backup(board, path, values):
+    """
+    Returns the value of the position after `path`, taking the minimax
+    over the values of the searched positions below it.
+    """
+    if path in values:
+        return values[path]
+    position = play(board, path)
+    children = [_backup(board, path + (action,), values)
+                for action in sorted(ttt.actions(position))]
+    return max(children) if ttt.player(position) == ttt.X else min(children)
+
+
+class ParallelMinimax():
+    """
+    Callable AI that splits each search over a process pool. Use it as a
+    context manager, or call `close`, to stop the workers.
+    """
+
+    def __init__(self, workers=None, split=1, search="minimax"):
+        if split < 1:
+            raise ValueError("split must be at least 1")
+        if search not in VALUES:
+            raise ValueError(f"unknown search: {search}")
+        self.pool = ProcessPoolExecutor(workers)
+        self.split = split
+        self.search = search
+        # nós visitados pelos processos na última busca
+        self.nodes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.shutdown()
+
+    def __call__(self, board):
+        """
+        Returns the optimal action for the current player on the board.
+        Among equally good actions the first in sorted order is taken.
+        """
+        if ttt.terminal(board):
+            return None
+
+        paths = split_paths(board, self.split)
+        jobs = [(play(board, path), self.search) for path in paths]
+        # map devolve os resultados na ordem dos jobs
+        results = list(self.pool.map(_search, jobs))
+        self.nodes = sum(nodes for _, nodes in results)
+        values = {path: value for path, (value, _) in zip(paths, results)}
+
+        scores = {action: _backup(board, (action,), values)
+                  for action in sorted(ttt.actions(board))}
+        if ttt.player(board) == ttt.X:
+            return max(scores, key=scores.get)
+        return min(scores, key=scores.get)
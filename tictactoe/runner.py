@@ -2,8 +2,23 @@ import pygame
 import sys
 import time
 
+import bitboard
+import book
+import mnk
 import tictactoe as ttt
 
+# IA escolhida pela linha de comando:
+# python runner.py [minimax|alphabeta|memo|bitboard|book|mnk]
+AIS = {
+    **ttt.ALGORITHMS,
+    "bitboard": bitboard.minimax,
+    "book": book.minimax,
+    "mnk": mnk.minimax,
+}
+if len(sys.argv) > 2 or (len(sys.argv) == 2 and sys.argv[1] not in AIS):
+    sys.exit(f"Usage: python runner.py [{'|'.join(AIS)}]")
+ai = AIS[sys.argv[1]] if len(sys.argv) == 2 else book.minimax
+
 pygame.init()
 size = width, height = 600, 400
 
@@ -112,8 +127,10 @@ while True:
         if user != player and not game_over:
             if ai_turn:
                 time.sleep(0.5)
-                move = ttt.minimax(board)
+                move = ai(board)
                 board = ttt.result(board, move)
+                if ai is ttt.minimax_memo:
+                    print(f"Transposition table: {ttt.TABLE.stats()}")
                 ai_turn = False
             else:
                 ai_turn = True
@@ -0,0 +1,132 @@
+"""
+AI-vs-AI games through the tictactoe API, as a throughput baseline.
+
+The first `--random-plies` moves of each game are random (seeded), so
+the games differ; the AIs play the rest. Reports the results, AI moves
+per second and, for AIs that count them, search nodes per second.
+
+Usage: python selfplay.py [--games N] [--x AI] [--o AI] [--random-plies P]
+                          [--seed S] [--workers W] [--split D]
+"""
+
+import argparse
+import random
+import time
+
+import bitboard
+import book
+import mnk
+import tictactoe as ttt
+from benchmark import count_nodes
+from parallel import ParallelMinimax
+
+
+def counted(algorithm):
+    """
+    Wraps a search from tictactoe.py to also return its node count.
+    """
+    def move(board):
+        action, nodes, _ = count_nodes(algorithm, board)
+        return action, nodes
+    return move
+
+
+def uncounted(algorithm):
+    """
+    Wraps a search whose nodes are not counted.
+    """
+    return lambda board: (algorithm(board), None)
+
+
+def mnk_move(board):
+    search = mnk.Search(mnk.Board.from_rows(mnk.Game(3, 3, 3, radius=None),
+                                            board))
+    action, _ = search.best_move()
+    return action, search.nodes
+
+
+def make_ais():
+    """
+    Returns the available AIs by name, each taking a board and returning
+    the action and the nodes searched (or None).
+    """
+    ais = {name: counted(algorithm)
+           for name, algorithm in ttt.ALGORITHMS.items()}
+    ais["bitboard"] = uncounted(bitboard.minimax)
+    ais["book"] = uncounted(book.minimax)
+    ais["mnk"] = mnk_move
+    return ais
+
+
+def play_games(ais, games, random_plies, seed):
+    """
+    Plays the games and returns the winner counts, the number of AI
+    moves, the nodes they searched and the seconds they took.
+    """
+    rng = random.Random(seed)
+    results = {ttt.X: 0, ttt.O: 0, None: 0}
+    moves = nodes = 0
+    seconds = 0.0
+    for _ in range(games):
+        board = ttt.initial_state()
+        ply = 0
+        while not ttt.terminal(board):
+            if ply < random_plies:
+                action = rng.choice(sorted(ttt.actions(board)))
+            else:
+                start = time.perf_counter()
+                action, searched = ais[ttt.player(board)](board)
+                seconds += time.perf_counter() - start
+                moves += 1
+                nodes += searched or 0
+            board = ttt.result(board, action)
+            ply += 1
+        results[ttt.winner(board)] += 1
+    return results, moves, nodes, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        usage="python selfplay.py [--games N] [--x AI] [--o AI] "
+              "[--random-plies P] [--seed S] [--workers W] [--split D]"
+    )
+    names = [*ttt.ALGORITHMS, "bitboard", "book", "mnk", "parallel"]
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--x", default="alphabeta", choices=names)
+    parser.add_argument("--o", default="alphabeta", choices=names)
+    parser.add_argument("--random-plies", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, help="processes for parallel")
+    parser.add_argument("--split", type=int, default=1,
+                        help="plies split across processes for parallel")
+    args = parser.parse_args()
+
+    ais = make_ais()
+    parallel = None
+    if "parallel" in (args.x, args.o):
+        parallel = ParallelMinimax(args.workers, args.split)
+
+        def parallel_move(board):
+            action = parallel(board)
+            return action, parallel.nodes
+        ais["parallel"] = parallel_move
+
+    try:
+        results, moves, nodes, seconds = play_games(
+            {ttt.X: ais[args.x], ttt.O: ais[args.o]},
+            args.games, args.random_plies, args.seed
+        )
+    finally:
+        if parallel is not None:
+            parallel.close()
+
+    print(f"{args.games} games, X={args.x} O={args.o}: "
+          f"X {results[ttt.X]}, O {results[ttt.O]}, ties {results[None]}")
+    print(f"{moves} AI moves in {seconds:.3f}s: "
+          f"{moves / seconds if seconds else 0:.1f} moves/sec")
+    if nodes:
+        print(f"{nodes} nodes: {nodes / seconds:.0f} nodes/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -84,6 +84,10 @@ def winner(board):
         return X
     elif board[0][2] == X and board[1][1] == X and board[2][0] == X:
         return X
+    elif board[0][0] == O and board[1][1] == O and board[2][2] == O:
+        return O
+    elif board[0][2] == O and board[1][1] == O and board[2][0] == O:
+        return O
     else:
         return None
         
@@ -169,4 +173,157 @@ def minvalue(board):
     v = 10
     for action in actions(board):
         v = min(v, maxvalue(result(board, action)))   
-    return v
\ No newline at end of file
+    return v
+
+# As 8 simetrias do tabuleiro (4 rotações, com e sem reflexão), cada uma
+# como a ordem em que as casas (i, j) são lidas
+SIMETRIAS = tuple(
+    tuple(transformacao(i, j) for i in range(3) for j in range(3))
+    for transformacao in (
+        lambda i, j: (i, j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i),
+    )
+)
+
+
+def canonical(board):
+    """
+    Returns a key shared by the board and all its rotations and
+    reflections, which have the same minimax value.
+    """
+    return min(
+        "".join(board[i][j] or "-" for i, j in simetria)
+        for simetria in SIMETRIAS
+    )
+
+
+class TranspositionTable():
+    """
+    Minimax values of boards already searched, keyed by `canonical`.
+    The same table can be passed to every `minimax_memo` call of a game.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.values)
+
+    def stats(self):
+        """
+        Returns the table counters as a dictionary.
+        """
+        return {"size": len(self.values), "hits": self.hits,
+                "misses": self.misses}
+
+    def value(self, board):
+        """
+        Returns the minimax value of the board, searching only positions
+        not seen before (up to symmetry).
+        """
+        chave = canonical(board)
+        if chave in self.values:
+            self.hits += 1
+            return self.values[chave]
+        self.misses += 1
+
+        if terminal(board):
+            v = utility(board)
+        elif player(board) == X:
+            v = max(self.value(result(board, action))
+                    for action in actions(board))
+        else:
+            v = min(self.value(result(board, action))
+                    for action in actions(board))
+        self.values[chave] = v
+        return v
+
+
+# tabela usada por padrão, compartilhada entre as jogadas da IA
+TABLE = TranspositionTable()
+
+
+def minimax_memo(board, table=TABLE):
+    """
+    Returns the optimal action for the current player on the board, like
+    `minimax`, reusing the values stored in `table`.
+    """
+    if terminal(board):
+        return None
+
+    jogadas = sorted(actions(board))
+    if player(board) == X:
+        return max(jogadas, key=lambda action: table.value(result(board, action)))
+    return min(jogadas, key=lambda action: table.value(result(board, action)))
+
+
+# Ordem em que as jogadas são tentadas na poda alfa-beta: centro, cantos
+# e por último as laterais, que participam de menos linhas
+ORDEM = ((1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (0, 1), (1, 0), (1, 2), (2, 1))
+
+
+def ordered_actions(board):
+    """
+    Returns the possible actions on the board, most promising first.
+    """
+    return [action for action in ORDEM if board[action[0]][action[1]] == EMPTY]
+
+
+def alphabeta(board):
+    """
+    Returns an optimal action for the current player on the board, using
+    alpha-beta pruning. Its value is always the value of the action chosen
+    by `minimax`; among equally good actions the first in `ORDEM` is taken.
+    """
+    if terminal(board):
+        return None
+
+    jogador = player(board)
+    jogada = None
+    alfa, beta = -10, 10
+    for action in ordered_actions(board):
+        v = alphabeta_value(result(board, action), alfa, beta)
+        if jogador == X and v > alfa:
+            alfa, jogada = v, action
+        elif jogador == O and v < beta:
+            beta, jogada = v, action
+    return jogada
+
+
+# valor minimax do tabuleiro, exato quando fica entre alfa e beta; fora
+# desse intervalo basta saber de que lado ele está
+def alphabeta_value(board, alfa, beta):
+    if terminal(board):
+        return utility(board)
+
+    if player(board) == X:
+        v = -10
+        for action in ordered_actions(board):
+            v = max(v, alphabeta_value(result(board, action), alfa, beta))
+            alfa = max(alfa, v)
+            if alfa >= beta:
+                break
+    else:
+        v = 10
+        for action in ordered_actions(board):
+            v = min(v, alphabeta_value(result(board, action), alfa, beta))
+            beta = min(beta, v)
+            if alfa >= beta:
+                break
+    return v
+
+
+# Algoritmos de busca disponíveis, por nome
+ALGORITHMS = {
+    "minimax": minimax,
+    "alphabeta": alphabeta,
+    "memo": minimax_memo,
+}